@@ -0,0 +1,20 @@
+-- CreateIndex
+CREATE INDEX "boards_userId_createdAt_idx" ON "boards"("userId", "createdAt");
+
+-- CreateIndex
+CREATE INDEX "columns_boardId_order_idx" ON "columns"("boardId", "order");
+
+-- CreateIndex
+CREATE INDEX "pomodoros_userId_status_startedAt_idx" ON "pomodoros"("userId", "status", "startedAt");
+
+-- CreateIndex
+CREATE INDEX "pomodoros_taskId_status_idx" ON "pomodoros"("taskId", "status");
+
+-- CreateIndex
+CREATE INDEX "tasks_userId_completed_startAt_idx" ON "tasks"("userId", "completed", "startAt");
+
+-- CreateIndex
+CREATE INDEX "tasks_userId_completed_endAt_idx" ON "tasks"("userId", "completed", "endAt");
+
+-- CreateIndex
+CREATE INDEX "tasks_columnId_idx" ON "tasks"("columnId");
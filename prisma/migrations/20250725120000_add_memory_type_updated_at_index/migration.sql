@@ -0,0 +1,2 @@
+-- CreateIndex
+CREATE INDEX "LumiMemory_userId_type_updatedAt_idx" ON "LumiMemory"("userId", "type", "updatedAt");
@@ -1,35 +1,94 @@
 import NodeCache from 'node-cache'
+import { getWorkerCount } from './workers'
 
-// Cache para contexto do usuário (5 minutos)
+// Cache para contexto do usuário (1 minuto - tarefas também mudam pelo Toivo)
 export const userContextCache = new NodeCache({
-  stdTTL: 300, // 5 minutos
+  stdTTL: 60, // 1 minuto
   checkperiod: 60, // Verifica expiração a cada 1 minuto
   useClones: false
 })
 
-// Cache para memórias frequentes (10 minutos)
+// Cache para memórias recentes (1 minuto, como o contexto)
 export const memoryCache = new NodeCache({
-  stdTTL: 600, // 10 minutos
-  checkperiod: 120, // Verifica expiração a cada 2 minutos
+  stdTTL: 60, // 1 minuto
+  checkperiod: 60, // Verifica expiração a cada 1 minuto
   useClones: false
 })
 
-// Cache para insights de produtividade (30 minutos)
+// Cache para insights de produtividade (1 minuto, como o contexto)
 export const insightsCache = new NodeCache({
-  stdTTL: 1800, // 30 minutos
-  checkperiod: 300, // Verifica expiração a cada 5 minutos
+  stdTTL: 60, // 1 minuto
+  checkperiod: 60, // Verifica expiração a cada 1 minuto
+  useClones: false
+})
+
+// Cache de usuários autenticados (5 minutos) - evita consultar o banco a cada requisição
+export const authUserCache = new NodeCache({
+  stdTTL: 300, // 5 minutos
+  checkperiod: 120, // Verifica expiração a cada 2 minutos
+  useClones: false
+})
+
+// Limite de intenções em cache: as chaves mudam a cada mensagem e a cada minuto
+export const INTENT_CACHE_MAX_KEYS = 5000
+
+// Cache de intenções interpretadas pelo LLM (1 minuto - o prompt muda a cada minuto)
+export const intentCache = new NodeCache({
+  stdTTL: 60, // 1 minuto
+  checkperiod: 60, // Verifica expiração a cada 1 minuto
+  maxKeys: INTENT_CACHE_MAX_KEYS,
   useClones: false
 })
 
+// Cargas do contexto do usuário em andamento (registradas pelo assistantService).
+// Ficam aqui para que invalidateUserCaches também as descarte: uma carga iniciada
+// antes de uma escrita não pode ser reaproveitada nem gravada no cache depois dela
+export const inFlightUserContexts = new Map<string, Promise<unknown>>()
+
+// TTL máximo dos caches por usuário (contexto e memórias recentes), em segundos
+export const USER_CACHE_TTL_SECONDS = 60
+
+// Os caches por usuário ficam na memória do processo e a invalidação só alcança o
+// processo que fez a escrita: com mais de um processo (WORKERS > 1) eles ficam desligados
+export function isPerUserCacheEnabled(): boolean {
+  return getWorkerCount() <= 1
+}
+
+// TTL (em segundos) limitado pelo primeiro expiresAt das memórias cacheadas, para que
+// uma memória não continue sendo servida como ativa depois de expirar. 0 = não cachear
+export function ttlUntilFirstExpiry(
+  maxTtlSeconds: number,
+  memories: ReadonlyArray<{ expiresAt: Date | null }>
+): number {
+  const now = Date.now()
+  let ttl = maxTtlSeconds
+  for (const memory of memories) {
+    if (memory.expiresAt) {
+      ttl = Math.min(ttl, Math.floor((memory.expiresAt.getTime() - now) / 1000))
+    }
+  }
+  return Math.max(ttl, 0)
+}
+
 // Função para gerar chave de cache
 export function generateCacheKey(prefix: string, userId: string, ...params: string[]): string {
   return `${prefix}:${userId}${params.length > 0 ? ':' + params.join(':') : ''}`
 }
 
+// Invalida os dados cacheados de um usuário após escritas em tarefas ou memórias
+export function invalidateUserCaches(userId: string): void {
+  userContextCache.del(generateCacheKey('context', userId))
+  inFlightUserContexts.delete(userId)
+  insightsCache.del(generateCacheKey('productivity', userId))
+  memoryCache.del(generateCacheKey('recent', userId))
+}
+
 // Limpa todo o cache
 export function clearAllCaches(): void {
   userContextCache.flushAll()
   memoryCache.flushAll()
   insightsCache.flushAll()
+  authUserCache.flushAll()
+  intentCache.flushAll()
   console.log('Todos os caches foram limpos')
 }
@@ -0,0 +1,17 @@
+import os from 'node:os'
+
+let resolvedWorkerCount: number | undefined
+
+/**
+ * Número de processos pedido em WORKERS ("auto" = até 4 núcleos; inválido = 1).
+ * Resolvido uma única vez e sob demanda, porque o .env é carregado depois da
+ * importação dos módulos. Fonte única para o servidor e para a política de cache
+ */
+export function getWorkerCount(): number {
+  if (resolvedWorkerCount === undefined) {
+    resolvedWorkerCount = process.env.WORKERS === 'auto'
+      ? Math.min(os.cpus().length, 4)
+      : Math.max(parseInt(process.env.WORKERS || '1', 10) || 1, 1)
+  }
+  return resolvedWorkerCount
+}
@@ -1,5 +1,7 @@
 import { config } from 'dotenv'
 import { buildServer } from './server'
+import { prisma } from './prisma/client'
+import { getWorkerCount } from './config/workers'
 
 // Carrega variáveis de ambiente
 config()
@@ -25,6 +27,11 @@ async function start() {
       process.env.JWT_SECRET = 'default-insecure-key-change-in-production'
     }
 
+    // Abre a conexão com o banco antes de aceitar requisições, para que a
+    // primeira requisição não pague o handshake (o Prisma conecta de forma preguiçosa)
+    await prisma.$connect()
+    console.log('🗄️  Conexão com o banco estabelecida')
+
     // Constrói e inicia o servidor
     const server = await buildServer()
     
@@ -40,4 +47,15 @@ async function start() {
   }
 }
 
+// O contexto de conversa, os caches por usuário e o rate limiter ficam na memória do
+// processo. Com node:cluster o processo principal distribui as conexões em rodízio,
+// então não há como manter cada usuário no mesmo worker: recusamos WORKERS > 1 até
+// esse estado ir para um armazenamento compartilhado. Para escalar, rode instâncias
+// separadas atrás de um balanceador com afinidade (sticky) por usuário
+const workerCount = getWorkerCount()
+if (workerCount > 1) {
+  console.error(`❌ WORKERS=${process.env.WORKERS} não é suportado: o estado da Lumi é por processo. Use WORKERS=1 e escale com instâncias separadas (sticky por usuário)`)
+  process.exit(1)
+}
+
 start()
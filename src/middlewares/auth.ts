@@ -6,9 +6,10 @@ export async function authMiddleware(
   reply: FastifyReply
 ) {
   try {
-    console.log('🔍 AuthMiddleware: Iniciando verificação de autenticação')
+    // Logs de rastreio vão pelo logger do Fastify (pino) em nível debug: os objetos só
+    // são serializados se o nível estiver habilitado, sem custo no caminho normal
     const authHeader = request.headers.authorization
-    console.log('🔍 AuthMiddleware: Authorization header presente:', !!authHeader)
+    request.log.debug({ hasAuthHeader: !!authHeader }, 'AuthMiddleware: iniciando verificação de autenticação')
     
     if (!authHeader || !authHeader.startsWith('Bearer ')) {
       console.log('❌ AuthMiddleware: Header Authorization ausente ou malformado')
@@ -19,7 +20,6 @@ export async function authMiddleware(
     }
 
     const token = authHeader.replace('Bearer ', '')
-    console.log('🔍 AuthMiddleware: Token extraído (primeiros 50 chars):', token.substring(0, 50) + '...')
 
     // Verifica o token JWT
     const payload = await authService.verifyToken(token)
@@ -32,8 +32,7 @@ export async function authMiddleware(
       })
     }
 
-    console.log('✅ AuthMiddleware: Autenticação bem-sucedida para usuário:', payload.userId)
-    console.log('🔍 AuthMiddleware: Payload completo:', JSON.stringify(payload, null, 2))
+    request.log.debug({ userId: payload.userId }, 'AuthMiddleware: autenticação bem-sucedida')
     
     // Validar se o userId é válido
     if (!payload.userId || typeof payload.userId !== 'string') {
@@ -52,8 +51,6 @@ export async function authMiddleware(
     }
     
     ;(request as any).user = user
-    
-    console.log('🔍 AuthMiddleware: Usuário definido no request:', JSON.stringify(user, null, 2))
 
     // Atualiza lastCheckIn em background (não bloqueia a requisição)
     setImmediate(() => {
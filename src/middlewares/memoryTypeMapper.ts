@@ -1,47 +1,49 @@
-import { FastifyRequest, FastifyReply } from 'fastify'
+import { FastifyRequest, FastifyReply, HookHandlerDoneFunction } from 'fastify'
+
+// Mapeamento de tipos similares para compatibilidade
+// Tabela somente leitura, criada uma vez e compartilhada por todas as requisições
+const typeMapping: Readonly<Record<string, string>> = Object.freeze({
+  'PERSONAL_CONTEXT': 'PERSONAL_CONTEXT', // Já existe agora
+  'PERSONAL_DATA': 'PERSONAL_INFO',
+  'PERSONAL': 'PERSONAL_INFO',
+  'WORK': 'WORK_CONTEXT',
+  'STUDY': 'STUDY_CONTEXT',
+  'EMOTION': 'EMOTIONAL_STATE',
+  'COMMUNICATION': 'COMMUNICATION_STYLE',
+  'GOAL': 'GOALS_PROJECTS',
+  'PROJECT': 'GOALS_PROJECTS',
+  'PREFERENCE': 'PREFERENCES',
+  'DATE': 'IMPORTANT_DATES',
+  'PRODUCTIVITY': 'PRODUCTIVITY_PATTERN'
+})
 
 /**
  * Middleware para mapear tipos de memória para garantir compatibilidade
- * Converte tipos similares automaticamente
+ * Converte tipos similares automaticamente.
+ * Não faz I/O, então é um hook síncrono (com done): evita alocar e aguardar
+ * uma Promise a cada requisição das rotas de memória
  */
-export async function memoryTypeMapperMiddleware(
+export function memoryTypeMapperMiddleware(
   request: FastifyRequest,
-  reply: FastifyReply
+  reply: FastifyReply,
+  done: HookHandlerDoneFunction
 ) {
-  // Aplica apenas para rotas de memória
-  if (!request.url.includes('/api/memories')) {
-    return
-  }
-
-  // Aplica apenas para métodos que enviam dados
-  if (request.method !== 'POST' && request.method !== 'PUT' && request.method !== 'PATCH') {
-    return
-  }
+  // Aplica apenas para rotas de memória que enviam dados
+  if (
+    request.url.includes('/api/memories') &&
+    (request.method === 'POST' || request.method === 'PUT' || request.method === 'PATCH')
+  ) {
+    const body = request.body as any
 
-  const body = request.body as any
-
-  if (body && body.type) {
-    // Mapeamento de tipos similares para compatibilidade
-    const typeMapping: Record<string, string> = {
-      'PERSONAL_CONTEXT': 'PERSONAL_CONTEXT', // Já existe agora
-      'PERSONAL_DATA': 'PERSONAL_INFO',
-      'PERSONAL': 'PERSONAL_INFO',
-      'WORK': 'WORK_CONTEXT',
-      'STUDY': 'STUDY_CONTEXT',
-      'EMOTION': 'EMOTIONAL_STATE',
-      'COMMUNICATION': 'COMMUNICATION_STYLE',
-      'GOAL': 'GOALS_PROJECTS',
-      'PROJECT': 'GOALS_PROJECTS',
-      'PREFERENCE': 'PREFERENCES',
-      'DATE': 'IMPORTANT_DATES',
-      'PRODUCTIVITY': 'PRODUCTIVITY_PATTERN'
-    }
-
-    // Se o tipo não é válido, tenta mapear
-    const originalType = body.type.toString().toUpperCase()
-    if (typeMapping[originalType]) {
-      body.type = typeMapping[originalType]
-      console.log(`🔄 Memory type mapped: ${originalType} → ${body.type}`)
+    if (body && body.type) {
+      // Se o tipo não é válido, tenta mapear
+      const originalType = body.type.toString().toUpperCase()
+      if (typeMapping[originalType]) {
+        body.type = typeMapping[originalType]
+        console.log(`🔄 Memory type mapped: ${originalType} → ${body.type}`)
+      }
     }
   }
+
+  done()
 }
@@ -1,14 +1,42 @@
 import { FastifyInstance } from 'fastify'
-import { AssistantService } from './assistantService'
+import { assistantService } from './assistantService'
 import { askRequestSchema } from '../../types'
 import { authMiddleware } from '../../middlewares/auth'
 import { strictRateLimitMiddleware } from '../../middlewares/rateLimiter'
 import { groq, GROQ_MODEL, MAX_TOKENS, TEMPERATURE } from '../../config/groq'
 import { getEmotionalTone } from '../../utils/emotionAnalyzer'
 
-export async function assistantRoutes(fastify: FastifyInstance) {
-  const assistantService = new AssistantService()
+// Schema de resposta do /ask-json: com ele o Fastify serializa via fast-json-stringify
+// compilado, sem percorrer o objeto com o JSON.stringify genérico
+const askJsonResponseSchema = {
+  200: {
+    type: 'object',
+    properties: {
+      success: { type: 'boolean' },
+      data: {
+        type: 'object',
+        properties: {
+          message: { type: 'string' },
+          emotionalTone: { type: 'string' },
+          taskAction: { type: 'string' },
+          conflictDetected: { type: 'boolean' },
+          suggestions: { type: 'array', items: { type: 'string' } },
+          context: {
+            type: 'object',
+            properties: {
+              detectedMood: { type: 'string' },
+              confidence: { type: 'number' },
+              strategy: { type: 'string' },
+              isTaskResponse: { type: 'boolean' }
+            }
+          }
+        }
+      }
+    }
+  }
+} as const
 
+export async function assistantRoutes(fastify: FastifyInstance) {
   // Middleware de autenticação e rate limiting para todas as rotas
   fastify.addHook('preHandler', authMiddleware)
   fastify.addHook('preHandler', strictRateLimitMiddleware)
@@ -47,7 +75,7 @@ export async function assistantRoutes(fastify: FastifyInstance) {
       }
 
       // Busca sugestões baseadas no estado emocional
-      const suggestions = await assistantService.getTaskSuggestions(user.id, emotionalAnalysis)
+      const suggestions = assistantService.getTaskSuggestions(user.id, emotionalAnalysis)
 
       // Prepara as mensagens para a IA
       const messages = [
@@ -119,7 +147,7 @@ export async function assistantRoutes(fastify: FastifyInstance) {
   })
 
   // Endpoint para resposta JSON completa (sem streaming)
-  fastify.post('/ask-json', async (request, reply) => {
+  fastify.post('/ask-json', { schema: { response: askJsonResponseSchema } }, async (request, reply) => {
     try {
       const user = (request as any).user
       const body = askRequestSchema.parse(request.body)
@@ -160,7 +188,7 @@ export async function assistantRoutes(fastify: FastifyInstance) {
       }
 
       // Busca sugestões baseadas no estado emocional
-      const suggestions = await assistantService.getTaskSuggestions(user.id, emotionalAnalysis)
+      const suggestions = assistantService.getTaskSuggestions(user.id, emotionalAnalysis)
 
       // Prepara as mensagens para a IA
       const messages = [
@@ -1,12 +1,63 @@
 import { UserService } from '../user/userService'
 import { TaskService } from '../task/taskService'
-import { TaskAssistant } from '../task/taskAssistant'
+import { TaskAssistant, taskAssistant } from '../task/taskAssistant'
 import { MemoryService } from '../memory/memoryService'
 import { UserContext, EmotionalAnalysis, TaskResponse } from '../../types'
 import { analyzeEmotion, analyzeEmotionWithContext } from '../../utils/emotionAnalyzer'
 import { buildLumiPrompt, extractMemoryFromResponse } from '../../utils/promptBuilder'
 import { prioritizeMemories } from '../../utils/helpers'
 import { conversationContextService } from '../../services/conversationContextService'
+import {
+  userContextCache,
+  inFlightUserContexts,
+  USER_CACHE_TTL_SECONDS,
+  isPerUserCacheEnabled,
+  ttlUntilFirstExpiry,
+  generateCacheKey
+} from '../../config/cache'
+import { User, LumiMemory, tasks } from '@prisma/client'
+
+// Dados brutos do banco usados para montar o contexto do usuário
+type UserContextData = [Pick<User, 'id' | 'name' | 'email'> | null, LumiMemory[], Pick<tasks, 'id' | 'title' | 'description' | 'priority' | 'startAt' | 'endAt' | 'completed'>[], UserContext['productivityInsights']]
+
+// Sugestões por estado emocional - listas fixas, compartilhadas entre as requisições
+const OVERWHELMED_SUGGESTIONS: readonly string[] = Object.freeze([
+  'Que tal priorizarmos apenas 1-2 tarefas importantes para hoje?',
+  'Vamos organizar suas tarefas por ordem de urgência?'
+])
+const PROCRASTINATING_SUGGESTIONS: readonly string[] = Object.freeze([
+  'Que tal começarmos com uma tarefa pequena, só para "quebrar o gelo"?',
+  'Vamos definir um timer de 15 minutos para uma atividade?'
+])
+const CONFUSED_SUGGESTIONS: readonly string[] = Object.freeze([
+  'Posso te ajudar a organizar suas ideias em etapas?',
+  'Vamos quebrar esse projeto em partes menores?'
+])
+const EXCITED_SUGGESTIONS: readonly string[] = Object.freeze([
+  'Com essa energia toda, que tal tacklearmos uma tarefa desafiadora?',
+  'Vamos aproveitar esse ânimo para adiantar algumas pendências?'
+])
+const TIRED_SUGGESTIONS: readonly string[] = Object.freeze([
+  'Que tal algo leve para hoje? Uma tarefa rápida só para sentir progresso?',
+  'Vamos focar no essencial e deixar o resto para quando você estiver melhor?'
+])
+const DEFAULT_SUGGESTIONS: readonly string[] = Object.freeze([
+  'Como posso te ajudar a organizar o dia?',
+  'Quer que eu analise suas prioridades?'
+])
+
+const MOOD_SUGGESTIONS: Partial<Record<EmotionalAnalysis['detectedMood'], readonly string[]>> = {
+  overwhelmed: OVERWHELMED_SUGGESTIONS,
+  sobrecarregado: OVERWHELMED_SUGGESTIONS,
+  procrastinating: PROCRASTINATING_SUGGESTIONS,
+  procrastinacao: PROCRASTINATING_SUGGESTIONS,
+  confused: CONFUSED_SUGGESTIONS,
+  confusao: CONFUSED_SUGGESTIONS,
+  excited: EXCITED_SUGGESTIONS,
+  entusiasmo: EXCITED_SUGGESTIONS,
+  tired: TIRED_SUGGESTIONS,
+  desmotivacao: TIRED_SUGGESTIONS
+}
 
 export class AssistantService {
   private userService: UserService
@@ -17,19 +68,67 @@ export class AssistantService {
   constructor() {
     this.userService = new UserService()
     this.taskService = new TaskService()
-    this.taskAssistant = new TaskAssistant()
+    this.taskAssistant = taskAssistant
     this.memoryService = new MemoryService()
   }
 
+  /**
+   * Busca os dados do usuário no banco, com cache curto por usuário.
+   * O cache é invalidado nas escritas de tarefas e memórias (invalidateUserCaches),
+   * segue a mesma política do cache de memórias recentes (desligado com mais de um
+   * processo) e nunca dura além do primeiro expiresAt das memórias carregadas.
+   */
+  private async fetchUserContextData(userId: string): Promise<UserContextData> {
+    const cacheEnabled = isPerUserCacheEnabled()
+    const cacheKey = generateCacheKey('context', userId)
+    if (cacheEnabled) {
+      const cached = userContextCache.get<UserContextData>(cacheKey)
+      if (cached) {
+        return cached
+      }
+    }
+
+    // Buscas em andamento por usuário: requisições simultâneas do mesmo usuário
+    // aguardam a mesma consulta em vez de repetir as idas ao banco
+    const inFlight = inFlightUserContexts.get(userId) as Promise<UserContextData> | undefined
+    if (inFlight) {
+      return inFlight
+    }
+
+    // As consultas são independentes entre si: dispara todas em paralelo
+    // (usuário, memórias recentes, tarefas pendentes agendadas e padrões de produtividade)
+    const request: Promise<UserContextData> = Promise.all([
+      this.userService.findById(userId),
+      this.memoryService.findRecentMemories(userId, 20),
+      this.taskService.findScheduledPendingTasks(userId),
+      this.memoryService.getProductivityPatterns(userId)
+    ]).then((data: UserContextData) => {
+      // Se uma escrita invalidou o usuário durante a carga, o registro já foi removido
+      // (invalidateUserCaches) e estes dados são de antes dela: não vão para o cache
+      if (cacheEnabled && data[0] && inFlightUserContexts.get(userId) === request) {
+        const ttl = ttlUntilFirstExpiry(USER_CACHE_TTL_SECONDS, data[1])
+        if (ttl > 0) {
+          userContextCache.set(cacheKey, data, ttl)
+        }
+      }
+      return data
+    }).finally(() => {
+      if (inFlightUserContexts.get(userId) === request) {
+        inFlightUserContexts.delete(userId)
+      }
+    })
+
+    inFlightUserContexts.set(userId, request)
+    return request
+  }
+
   async buildUserContext(userId: string): Promise<UserContext> {
-    // Busca dados do usuário
-    const user = await this.userService.findById(userId)
+    const [user, allMemories, allTasks, productivityInsights] = await this.fetchUserContextData(userId)
+
     if (!user) {
       throw new Error('Usuário não encontrado')
     }
 
-    // Busca memórias recentes
-    const allMemories = await this.memoryService.findRecentMemories(userId, 20)
     const recentMemories = allMemories.map(memory => ({
       id: memory.id,
       type: memory.type.toString(),
@@ -42,9 +141,6 @@ export class AssistantService {
       tags: memory.tags
     }))
 
-    // Busca todas as tarefas do usuário
-    const allTasks = await this.taskService.findPendingTasks(userId)
-    
     // 🚨 CORREÇÃO CRÍTICA: Filtragem de data mais precisa
     const now = new Date()
     
@@ -54,73 +150,61 @@ export class AssistantService {
     
     console.log('🔍 DEBUG - Data atual:', today.toISOString().split('T')[0])
     
-    // Tarefas de hoje (filtro mais rigoroso)
-    const todayTasks = allTasks.filter(task => {
-      if (!task.startAt) return false
-      
-      const taskDate = new Date(task.startAt)
-      const taskDateOnly = new Date(taskDate.getFullYear(), taskDate.getMonth(), taskDate.getDate())
-      
-      console.log('🔍 DEBUG - Comparando tarefa:', task.title, 'Data:', taskDateOnly.toISOString().split('T')[0])
-      
-      return taskDateOnly.getTime() === today.getTime()
-    }).map(task => ({
-      id: task.id,
-      title: task.title,
-      description: task.description || undefined,
-      priority: task.priority as 'HIGH' | 'MEDIUM' | 'LOW',
-      completed: task.completed,
-      startAt: task.startAt || undefined,
-      endAt: task.endAt || undefined
-    }))
+    // Uma única passada classifica cada tarefa em hoje / atrasada / futura,
+    // calculando a data (sem horário) de cada tarefa uma vez só
+    const todayTime = today.getTime()
+    const todayTasks: UserContext['todayTasks'] = []
+    const overdueTasks: UserContext['overdueTasks'] = []
+    const futureTasks: UserContext['currentTasks'] = []
 
-    // Tarefas atrasadas (antes de hoje)
-    const overdueTasks = allTasks.filter(task => {
-      if (!task.startAt || task.completed) return false
-      
-      const taskDate = new Date(task.startAt)
-      const taskDateOnly = new Date(taskDate.getFullYear(), taskDate.getMonth(), taskDate.getDate())
-      
-      return taskDateOnly.getTime() < today.getTime()
-    }).map(task => {
-      const taskDate = new Date(task.startAt!)
-      const taskDateOnly = new Date(taskDate.getFullYear(), taskDate.getMonth(), taskDate.getDate())
-      const daysOverdue = Math.floor((today.getTime() - taskDateOnly.getTime()) / (1000 * 60 * 60 * 24))
-      
-      return {
-        id: task.id,
-        title: task.title,
-        description: task.description || undefined,
-        priority: task.priority as 'HIGH' | 'MEDIUM' | 'LOW',
-        daysOverdue,
-        startAt: task.startAt || undefined
-      }
-    })
+    for (const task of allTasks) {
+      if (!task.startAt) continue
 
-    // Tarefas futuras (após hoje)
-    const futureTasks = allTasks.filter(task => {
-      if (!task.startAt || task.completed) return false
-      
       const taskDate = new Date(task.startAt)
-      const taskDateOnly = new Date(taskDate.getFullYear(), taskDate.getMonth(), taskDate.getDate())
-      
-      return taskDateOnly.getTime() > today.getTime()
-    }).map(task => ({
-      id: task.id,
-      title: task.title,
-      description: task.description || undefined,
-      priority: task.priority as 'HIGH' | 'MEDIUM' | 'LOW',
-      completed: task.completed,
-      startAt: task.startAt || undefined,
-      endAt: task.endAt || undefined
-    }))
+      const taskTime = new Date(taskDate.getFullYear(), taskDate.getMonth(), taskDate.getDate()).getTime()
+
+      if (taskTime === todayTime) {
+        console.log('🔍 DEBUG - Comparando tarefa:', task.title, 'Data:', new Date(taskTime).toISOString().split('T')[0])
+
+        // Tarefas de hoje (filtro mais rigoroso)
+        todayTasks.push({
+          id: task.id,
+          title: task.title,
+          description: task.description || undefined,
+          priority: task.priority as 'HIGH' | 'MEDIUM' | 'LOW',
+          completed: task.completed,
+          startAt: task.startAt,
+          endAt: task.endAt || undefined
+        })
+      } else if (task.completed) {
+        continue
+      } else if (taskTime < todayTime) {
+        // Tarefas atrasadas (antes de hoje)
+        overdueTasks.push({
+          id: task.id,
+          title: task.title,
+          description: task.description || undefined,
+          priority: task.priority as 'HIGH' | 'MEDIUM' | 'LOW',
+          daysOverdue: Math.floor((todayTime - taskTime) / (1000 * 60 * 60 * 24)),
+          startAt: task.startAt
+        })
+      } else {
+        // Tarefas futuras (após hoje)
+        futureTasks.push({
+          id: task.id,
+          title: task.title,
+          description: task.description || undefined,
+          priority: task.priority as 'HIGH' | 'MEDIUM' | 'LOW',
+          completed: task.completed,
+          startAt: task.startAt,
+          endAt: task.endAt || undefined
+        })
+      }
+    }
 
     // Todas as tarefas (para compatibilidade)
     const currentTasks = [...todayTasks, ...futureTasks].slice(0, 15)
 
-    // Busca insights de produtividade
-    const productivityInsights = await this.memoryService.getProductivityPatterns(userId)
-
     // Incluir contexto de conversa
     const conversationContext = conversationContextService.getOrCreateContext(userId)
 
@@ -259,17 +343,18 @@ export class AssistantService {
   ): Promise<void> {
     const extractedMemories = extractMemoryFromResponse(response, userMessage)
     
-    for (const memory of extractedMemories) {
-      if (memory.length > 10) { // Só salva memórias significativas
-        await this.memoryService.create({
-          userId,
-          type: 'COMMUNICATION_STYLE',
-          content: memory,
-          importance: 'MEDIUM',
-          tags: ['extracted_memory']
-        })
-      }
-    }
+    // Salva todas as memórias significativas de uma vez, em vez de um INSERT por memória
+    const memoriesToSave = extractedMemories
+      .filter(memory => memory.length > 10)
+      .map(memory => ({
+        userId,
+        type: 'COMMUNICATION_STYLE' as const,
+        content: memory,
+        importance: 'MEDIUM' as const,
+        tags: ['extracted_memory']
+      }))
+
+    await this.memoryService.createMany(memoriesToSave)
   }
 
   private determineMemoryType(info: string, userMessage: string): any {
@@ -321,46 +406,11 @@ export class AssistantService {
     })
   }
 
-  async getTaskSuggestions(userId: string, emotionalAnalysis: EmotionalAnalysis): Promise<string[]> {
-    const suggestions: string[] = []
-    
+  getTaskSuggestions(userId: string, emotionalAnalysis: EmotionalAnalysis): readonly string[] {
     // Sugestões baseadas no estado emocional
-    switch (emotionalAnalysis.detectedMood) {
-      case 'overwhelmed':
-      case 'sobrecarregado':
-        suggestions.push('Que tal priorizarmos apenas 1-2 tarefas importantes para hoje?')
-        suggestions.push('Vamos organizar suas tarefas por ordem de urgência?')
-        break
-        
-      case 'procrastinating':
-      case 'procrastinacao':
-        suggestions.push('Que tal começarmos com uma tarefa pequena, só para "quebrar o gelo"?')
-        suggestions.push('Vamos definir um timer de 15 minutos para uma atividade?')
-        break
-        
-      case 'confused':
-      case 'confusao':
-        suggestions.push('Posso te ajudar a organizar suas ideias em etapas?')
-        suggestions.push('Vamos quebrar esse projeto em partes menores?')
-        break
-        
-      case 'excited':
-      case 'entusiasmo':
-        suggestions.push('Com essa energia toda, que tal tacklearmos uma tarefa desafiadora?')
-        suggestions.push('Vamos aproveitar esse ânimo para adiantar algumas pendências?')
-        break
-        
-      case 'tired':
-      case 'desmotivacao':
-        suggestions.push('Que tal algo leve para hoje? Uma tarefa rápida só para sentir progresso?')
-        suggestions.push('Vamos focar no essencial e deixar o resto para quando você estiver melhor?')
-        break
-        
-      default:
-        suggestions.push('Como posso te ajudar a organizar o dia?')
-        suggestions.push('Quer que eu analise suas prioridades?')
-    }
-    
-    return suggestions
+    return MOOD_SUGGESTIONS[emotionalAnalysis.detectedMood] || DEFAULT_SUGGESTIONS
   }
 }
+
+// Instância singleton para uso na aplicação
+export const assistantService = new AssistantService()
@@ -4,6 +4,37 @@ import { memoryCreateSchema, memoryUpdateSchema, memoryQuerySchema } from '../..
 import { authMiddleware } from '../../middlewares/auth'
 import { memoryTypeMapperMiddleware } from '../../middlewares/memoryTypeMapper'
 
+// Estrutura conhecida de uma LumiMemory na resposta: com o schema tipado o Fastify
+// compila o serializador em vez de percorrer cada objeto de forma genérica
+const memoryItemSchema = {
+  type: 'object',
+  properties: {
+    id: { type: 'string' },
+    userId: { type: 'string' },
+    type: { type: 'string' },
+    content: { type: 'string' },
+    importance: { type: 'string' },
+    emotionalContext: { type: ['string', 'null'] },
+    productivityPattern: { type: ['string', 'null'] },
+    communicationStyle: { type: ['string', 'null'] },
+    createdAt: { type: 'string', format: 'date-time' },
+    updatedAt: { type: 'string', format: 'date-time' },
+    expiresAt: { type: ['string', 'null'], format: 'date-time' },
+    tags: { type: 'array', items: { type: 'string' } }
+  }
+} as const
+
+const memoryListResponseSchema = {
+  200: {
+    type: 'object',
+    properties: {
+      success: { type: 'boolean' },
+      data: { type: 'array', items: memoryItemSchema },
+      total: { type: 'integer' }
+    }
+  }
+} as const
+
 export async function memoryRoutes(fastify: FastifyInstance) {
   const memoryService = new MemoryService()
 
@@ -33,7 +64,7 @@ export async function memoryRoutes(fastify: FastifyInstance) {
   })
 
   // Buscar memórias do usuário
-  fastify.get('/memories', async (request, reply) => {
+  fastify.get('/memories', { schema: { response: memoryListResponseSchema } }, async (request, reply) => {
     try {
       const user = (request as any).user
       const queryParams = request.query as any
@@ -64,10 +95,14 @@ export async function memoryRoutes(fastify: FastifyInstance) {
   })
 
   // Buscar memórias recentes
-  fastify.get('/memories/recent', async (request, reply) => {
+  fastify.get('/memories/recent', { schema: { response: memoryListResponseSchema } }, async (request, reply) => {
     try {
       const user = (request as any).user
-      const { limit = 10 } = request.query as { limit?: number }
+      const queryParams = request.query as { limit?: string }
+      
+      // Query string chega como texto: converte para número antes de repassar ao Prisma (take)
+      const parsedLimit = queryParams.limit ? parseInt(queryParams.limit, 10) : 10
+      const limit = Number.isNaN(parsedLimit) ? 10 : Math.min(Math.max(parsedLimit, 1), 100)
       
       const memories = await memoryService.findRecentMemories(user.id, limit)
       
@@ -153,7 +188,7 @@ export async function memoryRoutes(fastify: FastifyInstance) {
   })
 
   // Buscar por conteúdo
-  fastify.get('/memories/search', async (request, reply) => {
+  fastify.get('/memories/search', { schema: { response: memoryListResponseSchema } }, async (request, reply) => {
     try {
       const user = (request as any).user
       const { q } = request.query as { q: string }
@@ -1,24 +1,73 @@
 import { prisma } from '../../prisma/client'
-import { MemoryCreate, MemoryUpdate, MemoryQuery } from '../../types'
-import { LumiMemory, MemoryType, ImportanceLevel } from '@prisma/client'
+import { MemoryCreate, MemoryUpdate, MemoryQuery, UserContext } from '../../types'
+import { LumiMemory, MemoryType, ImportanceLevel, Prisma } from '@prisma/client'
+import {
+  insightsCache,
+  memoryCache,
+  USER_CACHE_TTL_SECONDS,
+  isPerUserCacheEnabled,
+  ttlUntilFirstExpiry,
+  generateCacheKey,
+  invalidateUserCaches,
+  clearAllCaches
+} from '../../config/cache'
+
+/**
+ * Filtro de memórias ativas (não expiradas ou sem data de expiração).
+ * Centralizado para que todas as leituras usem a mesma regra de expiração
+ */
+function activeMemoryFilter(): Prisma.LumiMemoryWhereInput[] {
+  return [
+    { expiresAt: { gt: new Date() } }, // Não expirado
+    { expiresAt: null }                // Sem data de expiração
+  ]
+}
+
+/**
+ * Lê o JSON salvo em productivityPattern (gravado por createProductivityInsight).
+ * Texto livre é descartado sem passar pelo JSON.parse, evitando lançar e capturar
+ * uma exceção a cada leitura de padrões antigos.
+ */
+function parseProductivityPattern(raw: string): Record<string, any> | null {
+  if (!raw.trimStart().startsWith('{')) return null
+
+  try {
+    const parsed = JSON.parse(raw)
+    return parsed && typeof parsed === 'object' ? parsed : null
+  } catch {
+    return null
+  }
+}
 
 export class MemoryService {
   async create(data: MemoryCreate): Promise<LumiMemory> {
-    return prisma.lumiMemory.create({
+    const memory = await prisma.lumiMemory.create({
       data: {
         ...data,
         id: undefined, // Let Prisma generate the UUID
       }
     })
+
+    invalidateUserCaches(memory.userId)
+    return memory
+  }
+
+  /**
+   * Cria várias memórias em um único INSERT (uma ida ao banco)
+   */
+  async createMany(data: MemoryCreate[]): Promise<number> {
+    if (data.length === 0) return 0
+
+    const result = await prisma.lumiMemory.createMany({ data })
+
+    new Set(data.map(memory => memory.userId)).forEach(invalidateUserCaches)
+    return result.count
   }
 
   async findByUserId(query: MemoryQuery): Promise<LumiMemory[]> {
     const where: any = {
       userId: query.userId,
-      OR: [
-        { expiresAt: { gt: new Date() } }, // Não expirado
-        { expiresAt: null }                // Sem data de expiração
-      ]
+      OR: activeMemoryFilter()
     }
 
     if (query.type) {
@@ -47,13 +96,21 @@ export class MemoryService {
   }
 
   async findRecentMemories(userId: string, limit: number = 10): Promise<LumiMemory[]> {
-    return prisma.lumiMemory.findMany({
+    // Uma entrada por usuário com a maior lista já buscada: como a ordenação é sempre
+    // a mesma, limites menores são um prefixo dela. Invalidada em toda escrita de memória
+    const cacheEnabled = isPerUserCacheEnabled()
+    const cacheKey = generateCacheKey('recent', userId)
+    if (cacheEnabled) {
+      const cached = memoryCache.get<{ limit: number; memories: LumiMemory[] }>(cacheKey)
+      if (cached && cached.limit >= limit) {
+        return cached.memories.slice(0, limit)
+      }
+    }
+
+    const memories = await prisma.lumiMemory.findMany({
       where: {
         userId,
-        OR: [
-          { expiresAt: { gt: new Date() } },
-          { expiresAt: null }
-        ]
+        OR: activeMemoryFilter()
       },
       orderBy: [
         { importance: 'desc' },
@@ -61,6 +118,14 @@ export class MemoryService {
       ],
       take: limit
     })
+
+    if (cacheEnabled) {
+      const ttl = ttlUntilFirstExpiry(USER_CACHE_TTL_SECONDS, memories)
+      if (ttl > 0) {
+        memoryCache.set(cacheKey, { limit, memories }, ttl)
+      }
+    }
+    return memories
   }
 
   async findByType(userId: string, type: MemoryType): Promise<LumiMemory[]> {
@@ -68,29 +133,31 @@ export class MemoryService {
       where: {
         userId,
         type,
-        OR: [
-          { expiresAt: { gt: new Date() } },
-          { expiresAt: null }
-        ]
+        OR: activeMemoryFilter()
       },
       orderBy: { updatedAt: 'desc' }
     })
   }
 
   async update(id: string, data: Partial<MemoryUpdate>): Promise<LumiMemory> {
-    return prisma.lumiMemory.update({
+    const memory = await prisma.lumiMemory.update({
       where: { id },
       data: {
         ...data,
         updatedAt: new Date()
       }
     })
+
+    invalidateUserCaches(memory.userId)
+    return memory
   }
 
   async delete(id: string): Promise<void> {
-    await prisma.lumiMemory.delete({
+    const memory = await prisma.lumiMemory.delete({
       where: { id }
     })
+
+    invalidateUserCaches(memory.userId)
   }
 
   async deleteExpired(): Promise<number> {
@@ -101,6 +168,12 @@ export class MemoryService {
         }
       }
     })
+
+    // Memórias de vários usuários podem ter expirado: descarta os caches
+    if (result.count > 0) {
+      clearAllCaches()
+    }
+
     return result.count
   }
 
@@ -112,10 +185,7 @@ export class MemoryService {
           contains: searchTerm,
           mode: 'insensitive'
         },
-        OR: [
-          { expiresAt: { gt: new Date() } },
-          { expiresAt: null }
-        ]
+        OR: activeMemoryFilter()
       },
       orderBy: [
         { importance: 'desc' },
@@ -124,48 +194,52 @@ export class MemoryService {
     })
   }
 
-  async getProductivityPatterns(userId: string): Promise<{
-    bestTimeOfDay?: string
-    averageCompletionRate?: number
-    communicationStyle?: string
-    preferredTaskTypes?: string[]
-  }> {
-    const patterns = await prisma.lumiMemory.findMany({
-      where: {
-        userId,
-        type: 'PRODUCTIVITY_PATTERN',
-        OR: [
-          { expiresAt: { gt: new Date() } },
-          { expiresAt: null }
-        ]
-      },
-      orderBy: { updatedAt: 'desc' }
-    })
+  async getProductivityPatterns(userId: string): Promise<UserContext['productivityInsights']> {
+    // Insights são invalidados em toda escrita de memória do usuário e seguem a
+    // política dos caches por usuário (TTL curto, limitado pelo expiresAt das linhas usadas)
+    const cacheEnabled = isPerUserCacheEnabled()
+    const cacheKey = generateCacheKey('productivity', userId)
+    if (cacheEnabled) {
+      const cached = insightsCache.get<UserContext['productivityInsights']>(cacheKey)
+      if (cached) {
+        return cached
+      }
+    }
 
-    const communicationStyles = await prisma.lumiMemory.findMany({
-      where: {
-        userId,
-        type: 'COMMUNICATION_STYLE',
-        OR: [
-          { expiresAt: { gt: new Date() } },
-          { expiresAt: null }
-        ]
-      },
-      orderBy: { updatedAt: 'desc' }
-    })
+    // Só o registro mais recente de cada tipo é usado: o banco devolve apenas ele
+    const [latestPattern, latestStyle] = await Promise.all([
+      prisma.lumiMemory.findFirst({
+        where: {
+          userId,
+          type: 'PRODUCTIVITY_PATTERN',
+          OR: activeMemoryFilter()
+        },
+        // O JSON de productivityPattern segue como texto e só é parseado para o padrão mais recente
+        select: { content: true, productivityPattern: true, expiresAt: true },
+        orderBy: { updatedAt: 'desc' }
+      }),
+      prisma.lumiMemory.findFirst({
+        where: {
+          userId,
+          type: 'COMMUNICATION_STYLE',
+          OR: activeMemoryFilter()
+        },
+        select: { content: true, communicationStyle: true, expiresAt: true },
+        orderBy: { updatedAt: 'desc' }
+      })
+    ])
 
     // Analisa os padrões para extrair insights
     const insights: any = {}
 
-    if (patterns.length > 0) {
-      const latestPattern = patterns[0]
+    if (latestPattern) {
       if (latestPattern.productivityPattern) {
-        try {
-          const parsed = JSON.parse(latestPattern.productivityPattern)
+        const parsed = parseProductivityPattern(latestPattern.productivityPattern)
+        if (parsed) {
           insights.bestTimeOfDay = parsed.bestTimeOfDay
           insights.averageCompletionRate = parsed.averageCompletionRate
           insights.preferredTaskTypes = parsed.preferredTaskTypes
-        } catch (e) {
+        } else {
           // Se não conseguir parsear, extrai texto
           insights.bestTimeOfDay = latestPattern.content.includes('manhã') ? 'morning' :
                                   latestPattern.content.includes('tarde') ? 'afternoon' :
@@ -174,11 +248,20 @@ export class MemoryService {
       }
     }
 
-    if (communicationStyles.length > 0) {
-      insights.communicationStyle = communicationStyles[0].communicationStyle || 
-                                   communicationStyles[0].content
+    if (latestStyle) {
+      insights.communicationStyle = latestStyle.communicationStyle || 
+                                   latestStyle.content
     }
 
+    if (cacheEnabled) {
+      const sourceRows: Array<{ expiresAt: Date | null }> = []
+      if (latestPattern) sourceRows.push(latestPattern)
+      if (latestStyle) sourceRows.push(latestStyle)
+      const ttl = ttlUntilFirstExpiry(USER_CACHE_TTL_SECONDS, sourceRows)
+      if (ttl > 0) {
+        insightsCache.set(cacheKey, insights, ttl)
+      }
+    }
     return insights
   }
 
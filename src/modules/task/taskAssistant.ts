@@ -1,9 +1,181 @@
-import { TaskService, TaskCreateData } from './taskService'
+import { TaskService, TaskCreateData, HIGHEST_PRIORITY_FIRST } from './taskService'
 import { taskManager } from './taskManager'
 import { parseUserIntentFromLumi, ParsedIntent, hasTaskOrEmotionalPotential, decideBoardForTask } from '../../utils/intentParser'
 import { MemoryService } from '../memory/memoryService'
 import { prisma } from '../../prisma/client'
 
+// Intenções emocionais/situacionais - criado uma única vez, consultado a cada mensagem
+const EMOTIONAL_INTENTS: ReadonlySet<string> = new Set([
+  'seek_support',
+  'express_confusion',
+  'feeling_overwhelmed',
+  'procrastinating',
+  'seeking_motivation',
+  'feeling_stuck',
+  'sharing_excitement',
+  'expressing_frustration',
+  'checking_in',
+  'brainstorming',
+  'planning_assistance',
+  'asking_about_origin' // 🌟 NOVO: perguntas sobre origem
+])
+
+// Respostas para intenções emocionais - montadas uma única vez; só o template sorteado
+// é formatado com o nome do usuário
+const EMOTIONAL_RESPONSES: Readonly<Record<string, ReadonlyArray<(userName: string) => string>>> = {
+  seek_support: [
+    userName => `${userName}, estou aqui para você! 🤗 Me conta o que está acontecendo e vamos resolver juntos.`,
+    userName => `Claro que te ajudo, ${userName}! 💪 Qual é o desafio que você está enfrentando?`,
+    userName => `${userName}, pode contar comigo! 😊 Vamos descobrir a melhor forma de te apoiar.`
+  ],
+
+  express_confusion: [
+    userName => `${userName}, entendo que você está meio perdido... 🤔 Vamos organizar isso juntos, passo a passo!`,
+    userName => `Sem problemas, ${userName}! 🧭 Quando as coisas parecem confusas, é hora de quebrar em partes menores. Por onde começamos?`,
+    userName => `${userName}, você não está sozinho nessa! 💡 Vamos esclarecer as coisas juntos.`
+  ],
+
+  feeling_overwhelmed: [
+    userName => `${userName}, respira comigo! 🌊 Quando tudo parece demais, vamos focar numa coisa de cada vez.`,
+    userName => `Ei, ${userName}, você não precisa fazer tudo hoje! 🛡️ Vamos priorizar o que é realmente importante.`,
+    userName => `${userName}, é normal se sentir sobrecarregado às vezes. 🤗 Vamos organizar e simplificar isso juntos!`
+  ],
+
+  procrastinating: [
+    userName => `${userName}, entendo que não está no clima hoje... 😌 Que tal começarmos com algo bem pequeno?`,
+    userName => `Sem pressão, ${userName}! 🌱 Às vezes o primeiro passo é o mais difícil. Vamos encontrar algo leve pra começar?`,
+    userName => `${userName}, todo mundo tem dias assim! 💙 Que tal escolhermos uma tarefa de 5 minutos só pra quebrar o gelo?`
+  ],
+
+  seeking_motivation: [
+    userName => `${userName}, você já chegou tão longe! 🚀 Lembra dos seus objetivos? Vamos relembrar o que te motiva!`,
+    userName => `${userName}, eu acredito em você! ⚡ Que tal olharmos para uma conquista recente sua? Isso pode ajudar!`,
+    userName => `${userName}, você tem tudo que precisa! 🌟 Vamos encontrar aquela fagulha que vai te colocar em movimento!`
+  ],
+
+  feeling_stuck: [
+    userName => `${userName}, quando estamos travados, é hora de mudar a perspectiva! 🔄 Vamos tentar uma abordagem diferente?`,
+    userName => `${userName}, às vezes ficar preso é sinal de que precisa de uma pausa. 🧘 Que tal darmos um passo atrás?`,
+    userName => `${userName}, você não está realmente travado, só precisa de uma nova estratégia! 🎯 Vamos pensar juntos?`
+  ],
+
+  sharing_excitement: [
+    userName => `${userName}, que energia incrível! ⚡ Adoro ver você empolgado! Como posso ajudar a aproveitar esse momentum?`,
+    userName => `${userName}, sua empolgação é contagiante! 🎉 Vamos canalizar essa energia para algo produtivo?`,
+    userName => `${userName}, que legal! 🌟 Quando você está assim, é o momento perfeito para tacklear coisas desafiadoras!`
+  ],
+
+  expressing_frustration: [
+    userName => `${userName}, entendo sua frustração... 😤 Às vezes as coisas não saem como planejamos. Vamos resolver isso juntos!`,
+    userName => `${userName}, respiração profunda! 🌬️ Frustração é normal, mas vamos transformar isso em ação. O que podemos fazer?`,
+    userName => `${userName}, sei que é irritante! 😮‍💨 Mas você já superou coisas difíceis antes. Vamos encontrar uma solução!`
+  ],
+
+  checking_in: [
+    userName => `Oi ${userName}! 😊 Tudo tranquilo por aí? Como posso ajudar você hoje?`,
+    userName => `${userName}! 👋 Que bom te ver! Como está seu dia? Precisa de alguma coisa?`,
+    userName => `E aí, ${userName}! 🌞 Como você está se sentindo? Pronto para conquistar o dia?`
+  ],
+
+  brainstorming: [
+    userName => `${userName}, adoro brainstorming! 🧠💡 Me conta mais sobre o que você está pensando e vamos expandir essas ideias!`,
+    userName => `${userName}, que legal! 🎨 Adoro quando você quer trocar ideias. Qual é o contexto? Vamos criar algo incrível!`,
+    userName => `${userName}, perfeito! 🚀 Ideias são minha paixão! Me dá mais detalhes e vamos fazer essa criatividade fluir!`
+  ],
+
+  planning_assistance: [
+    userName => `${userName}, organização é uma das minhas especialidades! 📋 Me conta o que você precisa planejar e vamos estruturar isso juntos!`,
+    userName => `${userName}, adoro ajudar com planejamento! 🎯 Qual é o objetivo? Vamos criar uma estratégia clara e eficiente!`,
+    userName => `${userName}, vamos colocar ordem na casa! 📊 Me diz o que você quer organizar e eu te ajudo a criar um plano de ação!`
+  ]
+}
+
+// Ícone e descrição de cada prioridade numa única tabela (valores desconhecidos usam MEDIUM)
+const PRIORITY_LABELS: Readonly<Record<string, { icon: string; description: string }>> = Object.freeze({
+  HIGH: { icon: '🔴', description: 'alta prioridade' },
+  MEDIUM: { icon: '🟡', description: 'prioridade média' },
+  LOW: { icon: '🟢', description: 'baixa prioridade' }
+})
+
+// Dicas contextuais por tipo de tarefa/quadro, avaliadas em ordem (a primeira regra que casar vence)
+const TASK_TIP_RULES: ReadonlyArray<{ boardTerms: string[]; contextTerms: string[]; tips: string[] }> = [
+  {
+    boardTerms: ['academia', 'treino', 'exercício'],
+    contextTerms: ['treino', 'academia', 'exercício'],
+    tips: [
+      '🏋️ Dica: Hidrate-se bem durante o treino. Quer que eu te lembre de beber água?',
+      '⚡ Dica: Para treino de perna, foque em exercícios compostos como agachamento e stiff. Precisa de sugestões?',
+      '🎯 Dica: Registre seus pesos e séries para acompanhar evolução. Posso criar lembretes para isso!',
+      '🧘 Dica: Não esqueça do alongamento pós-treino. Quer que eu adicione na sua agenda?'
+    ]
+  },
+  {
+    boardTerms: ['trabalho', 'profissional'],
+    contextTerms: ['reunião', 'projeto', 'apresentação'],
+    tips: [
+      '📝 Dica: Para reuniões importantes, prepare uma agenda antecipadamente. Posso te ajudar a estruturar?',
+      '🎯 Dica: Defina objetivos claros para cada projeto. Quer quebrar essa tarefa em etapas menores?',
+      '⏰ Dica: Reserve 15 min antes de reuniões para revisar materiais. Adiciono um lembrete?',
+      '💡 Dica: Use a técnica Pomodoro para projetos complexos. Posso configurar intervalos para você?',
+      '📊 Dica: Documente decisões importantes. Precisa de ajuda para organizar um template?'
+    ]
+  },
+  {
+    boardTerms: ['estudo', 'faculdade', 'curso'],
+    contextTerms: ['estudar', 'prova', 'aula'],
+    tips: [
+      '📚 Dica: Use técnicas de revisão espaçada para melhor retenção. Posso criar um cronograma?',
+      '🧠 Dica: Faça pausas de 15 min a cada hora de estudo. Adiciono lembretes automáticos?',
+      '✏️ Dica: Pratique exercícios antes da prova. Quer que eu programe sessões de revisão?',
+      '🎯 Dica: Divida conteúdos grandes em blocos menores. Precisa de ajuda para organizar?',
+      '💡 Dica: Ensine o que aprendeu para fixar melhor. Posso sugerir formas de praticar?'
+    ]
+  },
+  {
+    boardTerms: ['saúde', 'médico'],
+    contextTerms: ['médico', 'consulta', 'exame'],
+    tips: [
+      '📋 Dica: Leve histórico médico e lista de medicamentos. Quer que eu organize isso?',
+      '⏰ Dica: Chegue 15 min antes da consulta. Adiciono um lembrete?',
+      '💊 Dica: Anote orientações médicas durante a consulta. Precisa de um template?',
+      '📱 Dica: Confirme a consulta um dia antes. Posso programar um lembrete automático?'
+    ]
+  },
+  {
+    boardTerms: ['compras', 'mercado'],
+    contextTerms: ['comprar', 'mercado'],
+    tips: [
+      '🛒 Dica: Faça uma lista organizada por seções do mercado. Posso te ajudar a estruturar?',
+      '💰 Dica: Defina um orçamento antes de sair. Quer que eu calcule um valor ideal?',
+      '📝 Dica: Verifique o que já tem em casa primeiro. Posso criar uma checklist?',
+      '🥗 Dica: Planeje refeições da semana para comprar apenas o necessário. Precisa de ideias?',
+      '⏰ Dica: Evite ir ao mercado com fome para não comprar por impulso!'
+    ]
+  }
+]
+
+// Dicas baseadas na prioridade quando não há contexto específico
+const PRIORITY_TIPS: Record<string, string[]> = {
+  HIGH: [
+    '🔥 Dica: Tarefas urgentes são melhores feitas logo pela manhã! Quer reorganizar sua agenda?',
+    '⚡ Dica: Elimine distrações para tarefas importantes. Posso sugerir técnicas de foco?',
+    '🎯 Dica: Quebre tarefas grandes em etapas menores. Precisa de ajuda para planejar?',
+    '💪 Dica: Use sua energia máxima para prioridades altas. Quer dicas de produtividade?'
+  ],
+  LOW: [
+    '😌 Dica: Tarefas simples são ótimas para intervalos entre atividades importantes!',
+    '🌱 Dica: Use tarefas leves para fazer pausas ativas. Quer sugestões?',
+    '📦 Dica: Agrupe várias tarefas simples e faça de uma vez só!',
+    '⏰ Dica: Reserve horários vagos para completar pendências menores.'
+  ],
+  MEDIUM: [
+    '📊 Dica: Organize tarefas por contexto para ser mais eficiente. Posso te ajudar?',
+    '⚖️ Dica: Balance tarefas médias com as de alta prioridade no seu dia!',
+    '⏱️ Dica: Use blocos de tempo para tarefas de complexidade média.',
+    '🎯 Dica: Mantenha foco mas sem pressão excessiva. Precisa de técnicas de concentração?'
+  ]
+}
+
 class TaskAssistant {
   private taskService: TaskService
   private taskManager = taskManager
@@ -52,9 +224,9 @@ class TaskAssistant {
    */
   private getOriginResponse(userName: string, message: string): string {
     // Detecta o tom da pergunta para adaptar a resposta
-    const isInformal = /oi|ei|cara|mano|aí|legal/.test(message.toLowerCase())
-    const isTechnical = /programou|desenvolveu|código|sistema|tecnologia/.test(message.toLowerCase())
-    const isPhilosophical = /por que|como você existe|qual seu propósito|significado/.test(message.toLowerCase())
+    const isInformal = /oi|ei|cara|mano|aí|legal/i.test(message)
+    const isTechnical = /programou|desenvolveu|código|sistema|tecnologia/i.test(message)
+    const isPhilosophical = /por que|como você existe|qual seu propósito|significado/i.test(message)
     
     let responses: string[] = []
     
@@ -158,19 +330,19 @@ class TaskAssistant {
           return await this.handleCreateBoard(userId, intent, userName)
         
         case 'update_task':
-          return await this.handleUpdateTask(userId, intent, userName)
+          return this.handleUpdateTask(userId, intent, userName)
         
         case 'delete_task':
-          return await this.handleDeleteTask(userId, intent, userName)
+          return this.handleDeleteTask(userId, intent, userName)
         
         case 'complete_task':
-          return await this.handleCompleteTask(userId, intent, userName)
+          return this.handleCompleteTask(userId, intent, userName)
         
         case 'list_tasks':
           return await this.handleListTasks(userId, userName)
         
         case 'search_tasks':
-          return await this.handleSearchTasks(userId, intent, userName)
+          return this.handleSearchTasks(userId, intent, userName)
         
         default:
           return {
@@ -191,22 +363,7 @@ class TaskAssistant {
    * Verifica se a intenção é emocional/situacional
    */
   private isEmotionalIntent(intent: string): boolean {
-    const emotionalIntents = [
-      'seek_support',
-      'express_confusion', 
-      'feeling_overwhelmed',
-      'procrastinating',
-      'seeking_motivation',
-      'feeling_stuck',
-      'sharing_excitement',
-      'expressing_frustration',
-      'checking_in',
-      'brainstorming',
-      'planning_assistance',
-      'asking_about_origin' // 🌟 NOVO: perguntas sobre origem
-    ]
-    
-    return emotionalIntents.includes(intent)
+    return EMOTIONAL_INTENTS.has(intent)
   }
 
   /**
@@ -218,80 +375,12 @@ class TaskAssistant {
       return this.getOriginResponse(userName, '') // Usa a função de origem que já existe
     }
 
-    const responses = {
-      seek_support: [
-        `${userName}, estou aqui para você! 🤗 Me conta o que está acontecendo e vamos resolver juntos.`,
-        `Claro que te ajudo, ${userName}! 💪 Qual é o desafio que você está enfrentando?`,
-        `${userName}, pode contar comigo! 😊 Vamos descobrir a melhor forma de te apoiar.`
-      ],
-      
-      express_confusion: [
-        `${userName}, entendo que você está meio perdido... 🤔 Vamos organizar isso juntos, passo a passo!`,
-        `Sem problemas, ${userName}! 🧭 Quando as coisas parecem confusas, é hora de quebrar em partes menores. Por onde começamos?`,
-        `${userName}, você não está sozinho nessa! 💡 Vamos esclarecer as coisas juntos.`
-      ],
-      
-      feeling_overwhelmed: [
-        `${userName}, respira comigo! 🌊 Quando tudo parece demais, vamos focar numa coisa de cada vez.`,
-        `Ei, ${userName}, você não precisa fazer tudo hoje! 🛡️ Vamos priorizar o que é realmente importante.`,
-        `${userName}, é normal se sentir sobrecarregado às vezes. 🤗 Vamos organizar e simplificar isso juntos!`
-      ],
-      
-      procrastinating: [
-        `${userName}, entendo que não está no clima hoje... 😌 Que tal começarmos com algo bem pequeno?`,
-        `Sem pressão, ${userName}! 🌱 Às vezes o primeiro passo é o mais difícil. Vamos encontrar algo leve pra começar?`,
-        `${userName}, todo mundo tem dias assim! 💙 Que tal escolhermos uma tarefa de 5 minutos só pra quebrar o gelo?`
-      ],
-      
-      seeking_motivation: [
-        `${userName}, você já chegou tão longe! 🚀 Lembra dos seus objetivos? Vamos relembrar o que te motiva!`,
-        `${userName}, eu acredito em você! ⚡ Que tal olharmos para uma conquista recente sua? Isso pode ajudar!`,
-        `${userName}, você tem tudo que precisa! 🌟 Vamos encontrar aquela fagulha que vai te colocar em movimento!`
-      ],
-      
-      feeling_stuck: [
-        `${userName}, quando estamos travados, é hora de mudar a perspectiva! 🔄 Vamos tentar uma abordagem diferente?`,
-        `${userName}, às vezes ficar preso é sinal de que precisa de uma pausa. 🧘 Que tal darmos um passo atrás?`,
-        `${userName}, você não está realmente travado, só precisa de uma nova estratégia! 🎯 Vamos pensar juntos?`
-      ],
-      
-      sharing_excitement: [
-        `${userName}, que energia incrível! ⚡ Adoro ver você empolgado! Como posso ajudar a aproveitar esse momentum?`,
-        `${userName}, sua empolgação é contagiante! 🎉 Vamos canalizar essa energia para algo produtivo?`,
-        `${userName}, que legal! 🌟 Quando você está assim, é o momento perfeito para tacklear coisas desafiadoras!`
-      ],
-      
-      expressing_frustration: [
-        `${userName}, entendo sua frustração... 😤 Às vezes as coisas não saem como planejamos. Vamos resolver isso juntos!`,
-        `${userName}, respiração profunda! 🌬️ Frustração é normal, mas vamos transformar isso em ação. O que podemos fazer?`,
-        `${userName}, sei que é irritante! 😮‍💨 Mas você já superou coisas difíceis antes. Vamos encontrar uma solução!`
-      ],
-      
-      checking_in: [
-        `Oi ${userName}! 😊 Tudo tranquilo por aí? Como posso ajudar você hoje?`,
-        `${userName}! 👋 Que bom te ver! Como está seu dia? Precisa de alguma coisa?`,
-        `E aí, ${userName}! 🌞 Como você está se sentindo? Pronto para conquistar o dia?`
-      ],
-      
-      brainstorming: [
-        `${userName}, adoro brainstorming! 🧠💡 Me conta mais sobre o que você está pensando e vamos expandir essas ideias!`,
-        `${userName}, que legal! 🎨 Adoro quando você quer trocar ideias. Qual é o contexto? Vamos criar algo incrível!`,
-        `${userName}, perfeito! 🚀 Ideias são minha paixão! Me dá mais detalhes e vamos fazer essa criatividade fluir!`
-      ],
-      
-      planning_assistance: [
-        `${userName}, organização é uma das minhas especialidades! 📋 Me conta o que você precisa planejar e vamos estruturar isso juntos!`,
-        `${userName}, adoro ajudar com planejamento! 🎯 Qual é o objetivo? Vamos criar uma estratégia clara e eficiente!`,
-        `${userName}, vamos colocar ordem na casa! 📊 Me diz o que você quer organizar e eu te ajudo a criar um plano de ação!`
-      ]
-    }
-
-    const intentResponses = responses[intent.intent as keyof typeof responses]
+    const intentResponses = EMOTIONAL_RESPONSES[intent.intent]
     if (!intentResponses) {
       return `${userName}, estou aqui para te apoiar! 💙 Me conta mais sobre o que você está sentindo.`
     }
 
-    return intentResponses[Math.floor(Math.random() * intentResponses.length)]
+    return intentResponses[Math.floor(Math.random() * intentResponses.length)](userName)
   }
 
   private async handleCreateTask(
@@ -318,28 +407,26 @@ class TaskAssistant {
       let boardInfo = ''
       
       if (boardDecision.action === 'create_new') {
-        // Criar novo quadro
+        // Criar novo quadro já com a coluna padrão "A fazer" (escrita aninhada, uma ida ao banco)
         const newBoard = await prisma.boards.create({
           data: {
             id: `board_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
             title: boardDecision.boardName,
             userId: userId,
-            updatedAt: new Date()
-          }
-        })
-        
-        // Criar coluna padrão "A fazer" no novo quadro
-        const defaultColumn = await prisma.columns.create({
-          data: {
-            id: `col_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
-            title: 'A fazer',
-            order: 1,
-            boardId: newBoard.id,
-            updatedAt: new Date()
-          }
+            updatedAt: new Date(),
+            columns: {
+              create: {
+                id: `col_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
+                title: 'A fazer',
+                order: 1,
+                updatedAt: new Date()
+              }
+            }
+          },
+          include: { columns: true }
         })
         
-        targetColumnId = defaultColumn.id
+        targetColumnId = newBoard.columns[0].id
         boardInfo = ` no novo quadro "${newBoard.title}"`
         
         // Salvar na memória que criou um quadro
@@ -459,16 +546,6 @@ class TaskAssistant {
         }
       }
 
-      // Criar novo quadro
-      const newBoard = await prisma.boards.create({
-        data: {
-          id: `board_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
-          title: intent.boardName,
-          userId: userId,
-          updatedAt: new Date()
-        }
-      })
-
       // Criar colunas padrão
       const defaultColumns = [
         { title: 'A fazer', order: 1 },
@@ -476,17 +553,25 @@ class TaskAssistant {
         { title: 'Concluído', order: 3 }
       ]
 
-      for (const columnData of defaultColumns) {
-        await prisma.columns.create({
-          data: {
-            id: `col_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
-            title: columnData.title,
-            order: columnData.order,
-            boardId: newBoard.id,
-            updatedAt: new Date()
+      // Criar novo quadro com as colunas padrão em um único INSERT em lote
+      const newBoard = await prisma.boards.create({
+        data: {
+          id: `board_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
+          title: intent.boardName,
+          userId: userId,
+          updatedAt: new Date(),
+          columns: {
+            createMany: {
+              data: defaultColumns.map(columnData => ({
+                id: `col_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
+                title: columnData.title,
+                order: columnData.order,
+                updatedAt: new Date()
+              }))
+            }
           }
-        })
-      }
+        }
+      })
 
       // Salvar na memória
       await this.memoryService.create({
@@ -513,11 +598,7 @@ class TaskAssistant {
   }
 
   private getPriorityDescription(priority: string): string {
-    switch (priority) {
-      case 'HIGH': return 'alta prioridade'
-      case 'LOW': return 'baixa prioridade'
-      default: return 'prioridade média'
-    }
+    return (PRIORITY_LABELS[priority] || PRIORITY_LABELS.MEDIUM).description
   }
 
   // 🔧 CORREÇÃO PROBLEMA 1: Método para formatar horário brasileiro
@@ -557,21 +638,25 @@ class TaskAssistant {
 
   private async handleListTasks(userId: string, userName: string): Promise<any> {
     try {
-      // Buscar tarefas do usuário
+      // Buscar tarefas do usuário - só os campos usados na mensagem: evita trazer
+      // (e manter em memória) a coluna e o quadro inteiros de cada tarefa
       const tasks = await prisma.tasks.findMany({
         where: { 
           userId,
           completed: false // Só tarefas não concluídas
         },
-        include: {
+        select: {
+          title: true,
+          priority: true,
+          startAt: true,
           columns: {
-            include: {
-              boards: true
+            select: {
+              boards: { select: { title: true } }
             }
           }
         },
         orderBy: [
-          { priority: 'desc' },
+          HIGHEST_PRIORITY_FIRST,
           { startAt: 'asc' }
         ]
       })
@@ -589,17 +674,24 @@ class TaskAssistant {
       const tomorrow = new Date(today)
       tomorrow.setDate(today.getDate() + 1)
       
-      const todayTasks = tasks.filter(task => 
-        task.startAt && this.isSameDate(task.startAt, today)
-      )
-      
-      const tomorrowTasks = tasks.filter(task => 
-        task.startAt && this.isSameDate(task.startAt, tomorrow)
-      )
-      
-      const otherTasks = tasks.filter(task => 
-        !task.startAt || (!this.isSameDate(task.startAt, today) && !this.isSameDate(task.startAt, tomorrow))
-      )
+      // Uma única passada separa as tarefas em hoje / amanhã / outras,
+      // comparando a data de cada tarefa só uma vez
+      const todayKey = today.toDateString()
+      const tomorrowKey = tomorrow.toDateString()
+      const todayTasks: typeof tasks = []
+      const tomorrowTasks: typeof tasks = []
+      const otherTasks: typeof tasks = []
+
+      for (const task of tasks) {
+        const taskKey = task.startAt ? task.startAt.toDateString() : null
+        if (taskKey === todayKey) {
+          todayTasks.push(task)
+        } else if (taskKey === tomorrowKey) {
+          tomorrowTasks.push(task)
+        } else {
+          otherTasks.push(task)
+        }
+      }
 
       let message = `📋 Aqui está sua agenda, ${userName}:\n\n`
 
@@ -658,56 +750,48 @@ class TaskAssistant {
     }
   }
 
-  private isSameDate(date1: Date, date2: Date): boolean {
-    return date1.toDateString() === date2.toDateString()
-  }
-
   private getPriorityIcon(priority: string): string {
-    switch (priority) {
-      case 'HIGH': return '🔴'
-      case 'LOW': return '🟢' 
-      default: return '🟡'
-    }
+    return (PRIORITY_LABELS[priority] || PRIORITY_LABELS.MEDIUM).icon
   }
 
-  private async handleCompleteTask(
+  private handleCompleteTask(
     userId: string, 
     intent: ParsedIntent, 
     userName: string
-  ): Promise<any> {
+  ): any {
     return {
       success: false,
       message: `${userName}, funcionalidade ainda não implementada! 🚧`
     }
   }
 
-  private async handleDeleteTask(
+  private handleDeleteTask(
     userId: string, 
     intent: ParsedIntent, 
     userName: string
-  ): Promise<any> {
+  ): any {
     return {
       success: false,
       message: `${userName}, funcionalidade ainda não implementada! 🚧`
     }
   }
 
-  private async handleUpdateTask(
+  private handleUpdateTask(
     userId: string, 
     intent: ParsedIntent, 
     userName: string
-  ): Promise<any> {
+  ): any {
     return {
       success: false,
       message: `${userName}, funcionalidade ainda não implementada! 🚧`
     }
   }
 
-  private async handleSearchTasks(
+  private handleSearchTasks(
     userId: string, 
     intent: ParsedIntent, 
     userName: string
-  ): Promise<any> {
+  ): any {
     return {
       success: false,
       message: `${userName}, funcionalidade ainda não implementada! 🚧`
@@ -719,93 +803,13 @@ class TaskAssistant {
     const board = (boardName || '').toLowerCase()
     
     // Dicas contextuais baseadas no tipo de tarefa/quadro
-    if (board.includes('academia') || board.includes('treino') || board.includes('exercício') || 
-        taskContext.includes('treino') || taskContext.includes('academia') || taskContext.includes('exercício')) {
-      const tips = [
-        '🏋️ Dica: Hidrate-se bem durante o treino. Quer que eu te lembre de beber água?',
-        '⚡ Dica: Para treino de perna, foque em exercícios compostos como agachamento e stiff. Precisa de sugestões?',
-        '🎯 Dica: Registre seus pesos e séries para acompanhar evolução. Posso criar lembretes para isso!',
-        '🧘 Dica: Não esqueça do alongamento pós-treino. Quer que eu adicione na sua agenda?'
-      ]
-      return tips[Math.floor(Math.random() * tips.length)]
-    }
-    
-    if (board.includes('trabalho') || board.includes('profissional') || 
-        taskContext.includes('reunião') || taskContext.includes('projeto') || taskContext.includes('apresentação')) {
-      const tips = [
-        '📝 Dica: Para reuniões importantes, prepare uma agenda antecipadamente. Posso te ajudar a estruturar?',
-        '🎯 Dica: Defina objetivos claros para cada projeto. Quer quebrar essa tarefa em etapas menores?',
-        '⏰ Dica: Reserve 15 min antes de reuniões para revisar materiais. Adiciono um lembrete?',
-        '💡 Dica: Use a técnica Pomodoro para projetos complexos. Posso configurar intervalos para você?',
-        '📊 Dica: Documente decisões importantes. Precisa de ajuda para organizar um template?'
-      ]
-      return tips[Math.floor(Math.random() * tips.length)]
-    }
-    
-    if (board.includes('estudo') || board.includes('faculdade') || board.includes('curso') ||
-        taskContext.includes('estudar') || taskContext.includes('prova') || taskContext.includes('aula')) {
-      const tips = [
-        '📚 Dica: Use técnicas de revisão espaçada para melhor retenção. Posso criar um cronograma?',
-        '🧠 Dica: Faça pausas de 15 min a cada hora de estudo. Adiciono lembretes automáticos?',
-        '✏️ Dica: Pratique exercícios antes da prova. Quer que eu programe sessões de revisão?',
-        '🎯 Dica: Divida conteúdos grandes em blocos menores. Precisa de ajuda para organizar?',
-        '💡 Dica: Ensine o que aprendeu para fixar melhor. Posso sugerir formas de praticar?'
-      ]
-      return tips[Math.floor(Math.random() * tips.length)]
-    }
-    
-    if (board.includes('saúde') || board.includes('médico') || 
-        taskContext.includes('médico') || taskContext.includes('consulta') || taskContext.includes('exame')) {
-      const tips = [
-        '📋 Dica: Leve histórico médico e lista de medicamentos. Quer que eu organize isso?',
-        '⏰ Dica: Chegue 15 min antes da consulta. Adiciono um lembrete?',
-        '💊 Dica: Anote orientações médicas durante a consulta. Precisa de um template?',
-        '📱 Dica: Confirme a consulta um dia antes. Posso programar um lembrete automático?'
-      ]
-      return tips[Math.floor(Math.random() * tips.length)]
-    }
+    const rule = TASK_TIP_RULES.find(({ boardTerms, contextTerms }) =>
+      boardTerms.some(term => board.includes(term)) ||
+      contextTerms.some(term => taskContext.includes(term))
+    )
+    const tips = rule ? rule.tips : (PRIORITY_TIPS[priority] || PRIORITY_TIPS.MEDIUM)
     
-    if (board.includes('compras') || board.includes('mercado') || 
-        taskContext.includes('comprar') || taskContext.includes('mercado')) {
-      const tips = [
-        '🛒 Dica: Faça uma lista organizada por seções do mercado. Posso te ajudar a estruturar?',
-        '💰 Dica: Defina um orçamento antes de sair. Quer que eu calcule um valor ideal?',
-        '📝 Dica: Verifique o que já tem em casa primeiro. Posso criar uma checklist?',
-        '🥗 Dica: Planeje refeições da semana para comprar apenas o necessário. Precisa de ideias?',
-        '⏰ Dica: Evite ir ao mercado com fome para não comprar por impulso!'
-      ]
-      return tips[Math.floor(Math.random() * tips.length)]
-    }
-    
-    // Dicas baseadas na prioridade quando não há contexto específico
-    switch (priority) {
-      case 'HIGH':
-        const highPriorityTips = [
-          '🔥 Dica: Tarefas urgentes são melhores feitas logo pela manhã! Quer reorganizar sua agenda?',
-          '⚡ Dica: Elimine distrações para tarefas importantes. Posso sugerir técnicas de foco?',
-          '🎯 Dica: Quebre tarefas grandes em etapas menores. Precisa de ajuda para planejar?',
-          '💪 Dica: Use sua energia máxima para prioridades altas. Quer dicas de produtividade?'
-        ]
-        return highPriorityTips[Math.floor(Math.random() * highPriorityTips.length)]
-        
-      case 'LOW':
-        const lowPriorityTips = [
-          '😌 Dica: Tarefas simples são ótimas para intervalos entre atividades importantes!',
-          '🌱 Dica: Use tarefas leves para fazer pausas ativas. Quer sugestões?',
-          '📦 Dica: Agrupe várias tarefas simples e faça de uma vez só!',
-          '⏰ Dica: Reserve horários vagos para completar pendências menores.'
-        ]
-        return lowPriorityTips[Math.floor(Math.random() * lowPriorityTips.length)]
-        
-      default:
-        const mediumPriorityTips = [
-          '📊 Dica: Organize tarefas por contexto para ser mais eficiente. Posso te ajudar?',
-          '⚖️ Dica: Balance tarefas médias com as de alta prioridade no seu dia!',
-          '⏱️ Dica: Use blocos de tempo para tarefas de complexidade média.',
-          '🎯 Dica: Mantenha foco mas sem pressão excessiva. Precisa de técnicas de concentração?'
-        ]
-        return mediumPriorityTips[Math.floor(Math.random() * mediumPriorityTips.length)]
-    }
+    return tips[Math.floor(Math.random() * tips.length)]
   }
 
   private getHelpfulResponse(userName: string, message: string): string {
@@ -828,4 +832,7 @@ class TaskAssistant {
   }
 }
 
-export { TaskAssistant }
\ No newline at end of file
+// Instância singleton para uso na aplicação
+export const taskAssistant = new TaskAssistant()
+
+export { TaskAssistant }
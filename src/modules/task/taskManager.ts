@@ -1,34 +1,39 @@
 import { z } from 'zod'
-import { TaskService, TaskCreateData, TaskUpdateData } from './taskService'
+import { TaskService, TaskCreateData, TaskUpdateData, TaskNotFoundError } from './taskService'
 import { prisma } from '../../prisma/client'
 import { Priority } from '@prisma/client'
 import crypto from 'crypto'
 
+// Tipos restritos compartilhados entre os schemas (construídos uma única vez)
+const taskPrioritySchema = z.enum(['HIGH', 'MEDIUM', 'LOW'])
+const taskIdSchema = z.string().uuid('ID da tarefa inválido')
+const pomodoroGoalSchema = z.number().int().positive()
+
 // Schemas de validação com Zod
 const createTaskSchema = z.object({
   title: z.string().min(1, 'Título é obrigatório').max(200, 'Título muito longo'),
   description: z.string().optional(),
-  priority: z.enum(['HIGH', 'MEDIUM', 'LOW']).default('MEDIUM'),
+  priority: taskPrioritySchema.default('MEDIUM'),
   startAt: z.date().optional(),
   endAt: z.date().optional(),
-  pomodoroGoal: z.number().int().positive().default(1),
+  pomodoroGoal: pomodoroGoalSchema.default(1),
   boardTitle: z.string().optional(), // Para especificar quadro específico
 })
 
 const updateTaskSchema = z.object({
-  taskId: z.string().uuid('ID da tarefa inválido'),
+  taskId: taskIdSchema,
   title: z.string().min(1).max(200).optional(),
   description: z.string().optional(),
-  priority: z.enum(['HIGH', 'MEDIUM', 'LOW']).optional(),
+  priority: taskPrioritySchema.optional(),
   startAt: z.date().optional(),
   endAt: z.date().optional(),
-  pomodoroGoal: z.number().int().positive().optional(),
+  pomodoroGoal: pomodoroGoalSchema.optional(),
   completed: z.boolean().optional(),
 })
 
 const taskActionSchema = z.object({
   userId: z.string().uuid('ID do usuário inválido'),
-  taskId: z.string().uuid('ID da tarefa inválido').optional(),
+  taskId: taskIdSchema.optional(),
 })
 
 type CreateTaskInput = z.infer<typeof createTaskSchema> & { userId: string }
@@ -41,6 +46,42 @@ export interface TaskOperationResult {
   error?: string
 }
 
+/**
+ * Converte um erro capturado em resultado de operação padronizado:
+ * tarefa inexistente vira TASK_NOT_FOUND (quando há mensagem para isso),
+ * erros do Zod viram VALIDATION_ERROR, o resto vira INTERNAL_ERROR
+ */
+function toErrorResult(
+  error: unknown,
+  messages: { log: string; validation: string; internal: string; notFound?: string }
+): TaskOperationResult {
+  if (error instanceof TaskNotFoundError && messages.notFound) {
+    console.log(`❌ [TaskManager] Tarefa não encontrada ou sem permissão`)
+    return {
+      success: false,
+      message: messages.notFound,
+      error: 'TASK_NOT_FOUND'
+    }
+  }
+
+  console.error(`❌ [TaskManager] ${messages.log}:`, error)
+
+  if (error instanceof z.ZodError) {
+    return {
+      success: false,
+      message: messages.validation,
+      error: 'VALIDATION_ERROR',
+      data: { errors: error.errors }
+    }
+  }
+
+  return {
+    success: false,
+    message: messages.internal,
+    error: 'INTERNAL_ERROR'
+  }
+}
+
 /**
  * Classe principal para gerenciamento de tarefas da Lumi
  * Implementa todas as operações CRUD com validações e logs completos
@@ -56,7 +97,6 @@ export class TaskManager {
   async createTask(input: CreateTaskInput): Promise<TaskOperationResult> {
     try {
       console.log(`🔄 [TaskManager] Iniciando criação de tarefa para usuário: ${input.userId}`)
-      console.log(`🔍 [TaskManager] Input completo:`, JSON.stringify(input, null, 2))
       
       // Validar entrada com Zod
       const validatedData = createTaskSchema.parse(input)
@@ -72,12 +112,29 @@ export class TaskManager {
         }
       }
 
-      // Determinar ou criar o quadro e coluna
-      const columnId = await this.getOrCreateColumnForTask(
-        input.userId, 
-        validatedData.title, 
-        validatedData.boardTitle
-      )
+      // Determinar ou criar o quadro e coluna e verificar conflitos de horário (se houver
+      // datas): as duas consultas são independentes, então rodam em paralelo
+      const { startAt, endAt } = validatedData
+      const [columnId, conflicts] = await Promise.all([
+        this.getOrCreateColumnForTask(
+          input.userId, 
+          validatedData.title, 
+          validatedData.boardTitle
+        ),
+        startAt && endAt
+          ? this.taskService.findTasksInTimeRange(input.userId, startAt, endAt)
+          : Promise.resolve([])
+      ])
+
+      if (conflicts.length > 0) {
+        console.log(`⚠️ [TaskManager] Conflito detectado para tarefa: ${validatedData.title}`)
+        return {
+          success: false,
+          message: `Conflito detectado: você já tem "${conflicts[0].title}" agendado para esse horário`,
+          error: 'TIME_CONFLICT',
+          data: { conflicts }
+        }
+      }
 
       // Preparar dados para criação
       const taskData: TaskCreateData = {
@@ -90,27 +147,7 @@ export class TaskManager {
         columnId
       }
 
-      // Verificar conflitos de horário se necessário
-      if (validatedData.startAt && validatedData.endAt) {
-        const conflicts = await this.taskService.findTasksInTimeRange(
-          input.userId,
-          validatedData.startAt,
-          validatedData.endAt
-        )
-
-        if (conflicts.length > 0) {
-          console.log(`⚠️ [TaskManager] Conflito detectado para tarefa: ${validatedData.title}`)
-          return {
-            success: false,
-            message: `Conflito detectado: você já tem "${conflicts[0].title}" agendado para esse horário`,
-            error: 'TIME_CONFLICT',
-            data: { conflicts }
-          }
-        }
-      }
-
       // Criar a tarefa
-      console.log(`🔍 [TaskManager] Dados para criação:`, JSON.stringify(taskData, null, 2))
       console.log(`🔍 [TaskManager] userId que será usado:`, input.userId)
       
       const task = await this.taskService.createTask(input.userId, taskData)
@@ -125,22 +162,11 @@ export class TaskManager {
       }
 
     } catch (error) {
-      console.error(`❌ [TaskManager] Erro ao criar tarefa:`, error)
-      
-      if (error instanceof z.ZodError) {
-        return {
-          success: false,
-          message: 'Dados inválidos para criação da tarefa',
-          error: 'VALIDATION_ERROR',
-          data: { errors: error.errors }
-        }
-      }
-
-      return {
-        success: false,
-        message: 'Erro interno ao criar tarefa',
-        error: 'INTERNAL_ERROR'
-      }
+      return toErrorResult(error, {
+        log: 'Erro ao criar tarefa',
+        validation: 'Dados inválidos para criação da tarefa',
+        internal: 'Erro interno ao criar tarefa'
+      })
     }
   }
 
@@ -156,20 +182,15 @@ export class TaskManager {
       // Validar entrada
       const validatedData = updateTaskSchema.parse(input)
       
-      // Verificar se a tarefa existe e pertence ao usuário
-      const existingTask = await this.taskService.findTaskById(validatedData.taskId, input.userId)
-      if (!existingTask) {
-        console.log(`❌ [TaskManager] Tarefa não encontrada ou sem permissão - ID: ${validatedData.taskId}`)
-        return {
-          success: false,
-          message: 'Tarefa não encontrada ou você não tem permissão para editá-la',
-          error: 'TASK_NOT_FOUND'
-        }
-      }
-
-      // Validar datas se fornecidas
+      // Validar datas se fornecidas. Tarefa inexistente ou de outro usuário continua
+      // tendo precedência: só neste caminho (raro) consultamos a tarefa antes de responder
       if (validatedData.startAt && validatedData.endAt) {
         if (validatedData.startAt >= validatedData.endAt) {
+          const existingTask = await this.taskService.findTaskById(validatedData.taskId, input.userId)
+          if (!existingTask) {
+            throw new TaskNotFoundError()
+          }
+
           return {
             success: false,
             message: 'Data de início deve ser anterior à data de fim',
@@ -188,7 +209,7 @@ export class TaskManager {
       if (validatedData.pomodoroGoal !== undefined) updateData.pomodoroGoal = validatedData.pomodoroGoal
       if (validatedData.completed !== undefined) updateData.completed = validatedData.completed
 
-      // Atualizar a tarefa
+      // Atualizar a tarefa (o filtro por userId no update já garante existência e posse)
       const updatedTask = await this.taskService.updateTask(validatedData.taskId, input.userId, updateData)
       
       console.log(`✅ [TaskManager] Tarefa atualizada com sucesso - ID: ${updatedTask.id}, Título: "${updatedTask.title}"`)
@@ -200,22 +221,12 @@ export class TaskManager {
       }
 
     } catch (error) {
-      console.error(`❌ [TaskManager] Erro ao atualizar tarefa:`, error)
-      
-      if (error instanceof z.ZodError) {
-        return {
-          success: false,
-          message: 'Dados inválidos para atualização da tarefa',
-          error: 'VALIDATION_ERROR',
-          data: { errors: error.errors }
-        }
-      }
-
-      return {
-        success: false,
-        message: 'Erro interno ao atualizar tarefa',
-        error: 'INTERNAL_ERROR'
-      }
+      return toErrorResult(error, {
+        log: 'Erro ao atualizar tarefa',
+        validation: 'Dados inválidos para atualização da tarefa',
+        internal: 'Erro interno ao atualizar tarefa',
+        notFound: 'Tarefa não encontrada ou você não tem permissão para editá-la'
+      })
     }
   }
 
@@ -232,18 +243,7 @@ export class TaskManager {
       // Validar IDs
       const validatedData = taskActionSchema.parse({ userId, taskId })
       
-      // Verificar se a tarefa existe e pertence ao usuário
-      const existingTask = await this.taskService.findTaskById(taskId, userId)
-      if (!existingTask) {
-        console.log(`❌ [TaskManager] Tarefa não encontrada ou sem permissão - ID: ${taskId}`)
-        return {
-          success: false,
-          message: 'Tarefa não encontrada ou você não tem permissão para excluí-la',
-          error: 'TASK_NOT_FOUND'
-        }
-      }
-
-      // Excluir a tarefa
+      // Excluir a tarefa (o filtro por userId no delete já garante existência e posse)
       const deletedTask = await this.taskService.deleteTask(taskId, userId)
       
       console.log(`✅ [TaskManager] Tarefa excluída com sucesso - ID: ${deletedTask.id}, Título: "${deletedTask.title}"`)
@@ -255,22 +255,12 @@ export class TaskManager {
       }
 
     } catch (error) {
-      console.error(`❌ [TaskManager] Erro ao excluir tarefa:`, error)
-      
-      if (error instanceof z.ZodError) {
-        return {
-          success: false,
-          message: 'Dados inválidos para exclusão da tarefa',
-          error: 'VALIDATION_ERROR',
-          data: { errors: error.errors }
-        }
-      }
-
-      return {
-        success: false,
-        message: 'Erro interno ao excluir tarefa',
-        error: 'INTERNAL_ERROR'
-      }
+      return toErrorResult(error, {
+        log: 'Erro ao excluir tarefa',
+        validation: 'Dados inválidos para exclusão da tarefa',
+        internal: 'Erro interno ao excluir tarefa',
+        notFound: 'Tarefa não encontrada ou você não tem permissão para excluí-la'
+      })
     }
   }
 
@@ -289,19 +279,25 @@ export class TaskManager {
       // Validar IDs
       const validatedData = taskActionSchema.parse({ userId, taskId })
       
-      // Verificar se a tarefa existe e pertence ao usuário
-      const existingTask = await this.taskService.findTaskById(taskId, userId)
-      if (!existingTask) {
-        console.log(`❌ [TaskManager] Tarefa não encontrada ou sem permissão - ID: ${taskId}`)
-        return {
-          success: false,
-          message: 'Tarefa não encontrada ou você não tem permissão para modificá-la',
-          error: 'TASK_NOT_FOUND'
+      // Atualizar status da tarefa direto: o UPDATE só casa se a tarefa for do usuário
+      // e ainda não estiver no status desejado (uma ida ao banco no caminho comum)
+      let updatedTask
+      try {
+        updatedTask = await this.taskService.setTaskCompletion(taskId, userId, completed)
+      } catch (error) {
+        if (!(error instanceof TaskNotFoundError)) throw error
+
+        // Caminho raro: descobre se a tarefa não existe ou se já está no status desejado
+        const existingTask = await this.taskService.findTaskById(taskId, userId)
+        if (!existingTask) {
+          console.log(`❌ [TaskManager] Tarefa não encontrada ou sem permissão - ID: ${taskId}`)
+          return {
+            success: false,
+            message: 'Tarefa não encontrada ou você não tem permissão para modificá-la',
+            error: 'TASK_NOT_FOUND'
+          }
         }
-      }
 
-      // Verificar se já está no status desejado
-      if (existingTask.completed === completed) {
         const statusText = completed ? 'já está concluída' : 'já está aberta'
         return {
           success: false,
@@ -309,9 +305,6 @@ export class TaskManager {
           error: 'ALREADY_IN_STATUS'
         }
       }
-
-      // Atualizar status da tarefa
-      const updatedTask = await this.taskService.updateTask(taskId, userId, { completed })
       
       const statusText = completed ? 'concluída' : 'reaberta'
       console.log(`✅ [TaskManager] Tarefa ${statusText} com sucesso - ID: ${updatedTask.id}, Título: "${updatedTask.title}"`)
@@ -323,22 +316,11 @@ export class TaskManager {
       }
 
     } catch (error) {
-      console.error(`❌ [TaskManager] Erro ao alterar status da tarefa:`, error)
-      
-      if (error instanceof z.ZodError) {
-        return {
-          success: false,
-          message: 'Dados inválidos para alteração de status da tarefa',
-          error: 'VALIDATION_ERROR',
-          data: { errors: error.errors }
-        }
-      }
-
-      return {
-        success: false,
-        message: 'Erro interno ao alterar status da tarefa',
-        error: 'INTERNAL_ERROR'
-      }
+      return toErrorResult(error, {
+        log: 'Erro ao alterar status da tarefa',
+        validation: 'Dados inválidos para alteração de status da tarefa',
+        internal: 'Erro interno ao alterar status da tarefa'
+      })
     }
   }
 
@@ -424,26 +406,28 @@ export class TaskManager {
       // Criar novo quadro e coluna
       console.log(`📋 [TaskManager] Criando novo quadro: "${inferredBoardTitle}"`)
       
+      // Quadro e coluna criados numa única escrita aninhada, com o mesmo instante de criação
+      const now = new Date()
       const newBoard = await prisma.boards.create({
         data: {
           id: crypto.randomUUID(),
           title: inferredBoardTitle,
           userId,
-          createdAt: new Date(),
-          updatedAt: new Date()
-        }
-      })
-
-      const newColumn = await prisma.columns.create({
-        data: {
-          id: crypto.randomUUID(),
-          title: 'A fazer',
-          order: 0,
-          boardId: newBoard.id,
-          createdAt: new Date(),
-          updatedAt: new Date()
-        }
+          createdAt: now,
+          updatedAt: now,
+          columns: {
+            create: {
+              id: crypto.randomUUID(),
+              title: 'A fazer',
+              order: 0,
+              createdAt: now,
+              updatedAt: now
+            }
+          }
+        },
+        include: { columns: true }
       })
+      const newColumn = newBoard.columns[0]
 
       console.log(`📋 [TaskManager] Novo quadro e coluna criados - Quadro: "${newBoard.title}", Coluna: "${newColumn.title}"`)
       
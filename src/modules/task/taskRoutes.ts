@@ -1,5 +1,5 @@
 import { FastifyInstance } from 'fastify'
-import { TaskAssistant } from './taskAssistant'
+import { taskAssistant } from './taskAssistant'
 import { TaskService } from './taskService'
 import { authMiddleware } from '../../middlewares/auth'
 import { rateLimitMiddleware } from '../../middlewares/rateLimiter'
@@ -9,8 +9,59 @@ const taskMessageSchema = z.object({
   message: z.string().min(1).max(1000)
 })
 
+// Schemas de resposta: o Fastify compila um serializador dedicado (fast-json-stringify)
+// para cada rota, em vez de passar pelo JSON.stringify genérico
+const taskSummarySchema = {
+  type: 'object',
+  properties: {
+    pending: { type: 'integer' },
+    completed: { type: 'integer' },
+    overdue: { type: 'integer' },
+    today: { type: 'integer' },
+    highPriority: { type: 'integer' }
+  }
+} as const
+
+const taskListItemSchema = {
+  type: 'object',
+  properties: {
+    id: { type: 'string' },
+    title: { type: 'string' },
+    description: { type: ['string', 'null'] },
+    priority: { type: 'string' },
+    startAt: { type: ['string', 'null'], format: 'date-time' },
+    endAt: { type: ['string', 'null'], format: 'date-time' },
+    completed: { type: 'boolean' }
+  }
+} as const
+
+const listResponseSchema = {
+  200: {
+    type: 'object',
+    properties: {
+      success: { type: 'boolean' },
+      data: {
+        type: 'object',
+        properties: {
+          tasks: { type: 'array', items: taskListItemSchema },
+          summary: taskSummarySchema
+        }
+      }
+    }
+  }
+} as const
+
+const summaryResponseSchema = {
+  200: {
+    type: 'object',
+    properties: {
+      success: { type: 'boolean' },
+      data: taskSummarySchema
+    }
+  }
+} as const
+
 export async function taskRoutes(fastify: FastifyInstance) {
-  const taskAssistant = new TaskAssistant()
   const taskService = new TaskService()
 
   fastify.addHook('preHandler', authMiddleware)
@@ -52,25 +103,20 @@ export async function taskRoutes(fastify: FastifyInstance) {
   })
 
   // Endpoint para listar tarefas do usuário
-  fastify.get('/list', async (request, reply) => {
+  fastify.get('/list', { schema: { response: listResponseSchema } }, async (request, reply) => {
     try {
       const user = (request as any).user
       
-      const tasks = await taskService.findPendingTasks(user.id)
-      const summary = await taskService.getTaskSummary(user.id)
+      // Consultas independentes: lista e resumo rodam em paralelo
+      const [tasks, summary] = await Promise.all([
+        taskService.findPendingTaskListItems(user.id, 10),
+        taskService.getTaskSummary(user.id)
+      ])
 
       return reply.send({
         success: true,
         data: {
-          tasks: tasks.slice(0, 10).map(task => ({
-            id: task.id,
-            title: task.title,
-            description: task.description,
-            priority: task.priority,
-            startAt: task.startAt,
-            endAt: task.endAt,
-            completed: task.completed
-          })),
+          tasks,
           summary
         }
       })
@@ -85,7 +131,7 @@ export async function taskRoutes(fastify: FastifyInstance) {
   })
 
   // Endpoint para obter resumo das tarefas
-  fastify.get('/summary', async (request, reply) => {
+  fastify.get('/summary', { schema: { response: summaryResponseSchema } }, async (request, reply) => {
     try {
       const user = (request as any).user
       const summary = await taskService.getTaskSummary(user.id)
@@ -1,5 +1,42 @@
 import { prisma } from '../../prisma/client'
-import { tasks, Priority } from '@prisma/client'
+import { tasks, Priority, Prisma } from '@prisma/client'
+import { invalidateUserCaches } from '../../config/cache'
+
+/**
+ * Erro lançado quando a tarefa não existe ou não pertence ao usuário
+ */
+export class TaskNotFoundError extends Error {
+  constructor() {
+    super('Tarefa não encontrada ou sem permissão')
+    this.name = 'TaskNotFoundError'
+  }
+}
+
+/**
+ * Traduz o "registro não encontrado" do Prisma (P2025) para o erro de permissão
+ * usado pelo serviço; qualquer outro erro é repassado como está
+ */
+function rethrowIfNotFound(error: unknown): never {
+  if (error instanceof Prisma.PrismaClientKnownRequestError && error.code === 'P2025') {
+    throw new TaskNotFoundError()
+  }
+  throw error
+}
+
+/**
+ * Ordenação "mais prioritária primeiro". O enum Priority do Postgres é ordenado pela
+ * declaração (HIGH, MEDIUM, LOW), então a ordem crescente já é o ranking correto;
+ * com 'desc' as tarefas LOW vinham antes e as HIGH ficavam de fora dos limites
+ */
+export const HIGHEST_PRIORITY_FIRST: Prisma.tasksOrderByWithRelationInput = { priority: 'asc' }
+
+/**
+ * Parâmetro de data para SQL cru: o Prisma grava DateTime em UTC em colunas
+ * "timestamp" sem fuso, então comparamos com o instante convertido para UTC
+ */
+function utcTimestamp(date: Date): Prisma.Sql {
+  return Prisma.sql`(${date.toISOString()}::timestamptz AT TIME ZONE 'UTC')`
+}
 
 export interface TaskCreateData {
   title: string
@@ -27,7 +64,7 @@ export class TaskService {
       where: { userId },
       orderBy: [
         { completed: 'asc' },
-        { priority: 'desc' },
+        HIGHEST_PRIORITY_FIRST,
         { createdAt: 'desc' }
       ],
       take: limit
@@ -41,12 +78,61 @@ export class TaskService {
         completed: false 
       },
       orderBy: [
-        { priority: 'desc' },
+        HIGHEST_PRIORITY_FIRST,
+        { createdAt: 'desc' }
+      ]
+    })
+  }
+
+  // Contexto da Lumi: só tarefas pendentes com data de início (as únicas classificadas
+  // em hoje/atrasadas/futuras), filtradas e projetadas no próprio banco
+  async findScheduledPendingTasks(userId: string): Promise<Pick<tasks, 'id' | 'title' | 'description' | 'priority' | 'startAt' | 'endAt' | 'completed'>[]> {
+    return prisma.tasks.findMany({
+      where: { 
+        userId, 
+        completed: false,
+        startAt: { not: null }
+      },
+      select: {
+        id: true,
+        title: true,
+        description: true,
+        priority: true,
+        startAt: true,
+        endAt: true,
+        completed: true
+      },
+      orderBy: [
+        HIGHEST_PRIORITY_FIRST,
         { createdAt: 'desc' }
       ]
     })
   }
 
+  // Já traz só os campos expostos pela API, limitados no banco, para a rota enviar as linhas direto
+  async findPendingTaskListItems(userId: string, limit: number = 10): Promise<Pick<tasks, 'id' | 'title' | 'description' | 'priority' | 'startAt' | 'endAt' | 'completed'>[]> {
+    return prisma.tasks.findMany({
+      where: { 
+        userId, 
+        completed: false 
+      },
+      select: {
+        id: true,
+        title: true,
+        description: true,
+        priority: true,
+        startAt: true,
+        endAt: true,
+        completed: true
+      },
+      orderBy: [
+        HIGHEST_PRIORITY_FIRST,
+        { createdAt: 'desc' }
+      ],
+      take: limit
+    })
+  }
+
   async findTasksByPriority(userId: string, priority: Priority): Promise<tasks[]> {
     return prisma.tasks.findMany({
       where: { 
@@ -92,13 +178,16 @@ export class TaskService {
   }
 
   async markAsCompleted(taskId: string): Promise<tasks> {
-    return prisma.tasks.update({
+    const task = await prisma.tasks.update({
       where: { id: taskId },
       data: { 
         completed: true,
         updatedAt: new Date()
       }
     })
+
+    invalidateUserCaches(task.userId)
+    return task
   }
 
   async getTaskSummary(userId: string): Promise<{
@@ -113,62 +202,31 @@ export class TaskService {
     const endOfDay = new Date(startOfDay)
     endOfDay.setDate(endOfDay.getDate() + 1)
 
-    const [
-      pending,
-      completed,
-      overdue,
-      today,
-      highPriority
-    ] = await Promise.all([
-      prisma.tasks.count({
-        where: { userId, completed: false }
-      }),
-      prisma.tasks.count({
-        where: { userId, completed: true }
-      }),
-      prisma.tasks.count({
-        where: {
-          userId,
-          completed: false,
-          endAt: { lt: now }
-        }
-      }),
-      prisma.tasks.count({
-        where: {
-          userId,
-          completed: false,
-          OR: [
-            {
-              startAt: {
-                gte: startOfDay,
-                lt: endOfDay
-              }
-            },
-            {
-              endAt: {
-                gte: startOfDay,
-                lt: endOfDay
-              }
-            }
-          ]
-        }
-      }),
-      prisma.tasks.count({
-        where: {
-          userId,
-          completed: false,
-          priority: 'HIGH'
-        }
-      })
-    ])
-
-    return {
-      pending,
-      completed,
-      overdue,
-      today,
-      highPriority
-    }
+    // Uma única varredura das tarefas do usuário calcula os cinco contadores,
+    // em vez de cinco COUNT separados
+    const [summary] = await prisma.$queryRaw<Array<{
+      pending: number
+      completed: number
+      overdue: number
+      today: number
+      highPriority: number
+    }>>`
+      SELECT
+        COUNT(*) FILTER (WHERE NOT "completed")::int AS "pending",
+        COUNT(*) FILTER (WHERE "completed")::int AS "completed",
+        COUNT(*) FILTER (WHERE NOT "completed" AND "endAt" < ${utcTimestamp(now)})::int AS "overdue",
+        COUNT(*) FILTER (
+          WHERE NOT "completed" AND (
+            ("startAt" >= ${utcTimestamp(startOfDay)} AND "startAt" < ${utcTimestamp(endOfDay)}) OR
+            ("endAt" >= ${utcTimestamp(startOfDay)} AND "endAt" < ${utcTimestamp(endOfDay)})
+          )
+        )::int AS "today",
+        COUNT(*) FILTER (WHERE NOT "completed" AND "priority" = 'HIGH')::int AS "highPriority"
+      FROM "tasks"
+      WHERE "userId" = ${userId}
+    `
+
+    return summary
   }
 
   async findTasksInTimeRange(userId: string, startDate: Date, endDate: Date): Promise<tasks[]> {
@@ -195,6 +253,7 @@ export class TaskService {
   }
 
   async createTask(userId: string, data: TaskCreateData): Promise<tasks> {
+    const now = new Date()
     const task = await prisma.tasks.create({
       data: {
         id: crypto.randomUUID(),
@@ -207,45 +266,56 @@ export class TaskService {
         pomodoroGoal: data.pomodoroGoal || 1,
         columnId: data.columnId,
         completed: false,
-        createdAt: new Date(),
-        updatedAt: new Date()
+        createdAt: now,
+        updatedAt: now
       }
     })
 
     console.log(`✅ Tarefa criada via Lumi: ${task.title} (${task.priority})`)
+    invalidateUserCaches(userId)
     return task
   }
 
   async updateTask(taskId: string, userId: string, data: TaskUpdateData): Promise<tasks> {
-    const task = await prisma.tasks.findFirst({
-      where: { id: taskId, userId }
-    })
-
-    if (!task) {
-      throw new Error('Tarefa não encontrada ou sem permissão')
-    }
-
-    return prisma.tasks.update({
-      where: { id: taskId },
+    // O filtro por userId no próprio update já garante a posse da tarefa,
+    // sem precisar de um findFirst antes
+    const updatedTask = await prisma.tasks.update({
+      where: { id: taskId, userId },
       data: {
         ...data,
         updatedAt: new Date()
       }
-    })
+    }).catch(rethrowIfNotFound)
+
+    invalidateUserCaches(userId)
+    return updatedTask
   }
 
   async deleteTask(taskId: string, userId: string): Promise<tasks> {
-    const task = await prisma.tasks.findFirst({
+    const deletedTask = await prisma.tasks.delete({
       where: { id: taskId, userId }
-    })
+    }).catch(rethrowIfNotFound)
 
-    if (!task) {
-      throw new Error('Tarefa não encontrada ou sem permissão')
-    }
+    invalidateUserCaches(userId)
+    return deletedTask
+  }
 
-    return prisma.tasks.delete({
-      where: { id: taskId }
-    })
+  /**
+   * Altera o status de conclusão num único UPDATE condicionado ao status atual.
+   * Lança TaskNotFoundError se a tarefa não existir, não for do usuário
+   * ou já estiver no status pedido
+   */
+  async setTaskCompletion(taskId: string, userId: string, completed: boolean): Promise<tasks> {
+    const updatedTask = await prisma.tasks.update({
+      where: { id: taskId, userId, completed: !completed },
+      data: {
+        completed,
+        updatedAt: new Date()
+      }
+    }).catch(rethrowIfNotFound)
+
+    invalidateUserCaches(userId)
+    return updatedTask
   }
 
   async completeTask(taskId: string, userId: string): Promise<tasks> {
@@ -268,7 +338,7 @@ export class TaskService {
         ]
       },
       orderBy: [
-        { priority: 'desc' },
+        HIGHEST_PRIORITY_FIRST,
         { createdAt: 'desc' }
       ],
       take: limit
@@ -282,28 +352,29 @@ export class TaskService {
     })
 
     if (!board || !board.columns.length) {
+      // Quadro e coluna criados numa única escrita aninhada, com o mesmo instante de criação
+      const now = new Date()
       const newBoard = await prisma.boards.create({
         data: {
           id: crypto.randomUUID(),
           title: 'Minha Agenda',
           userId,
-          createdAt: new Date(),
-          updatedAt: new Date()
-        }
-      })
-
-      const column = await prisma.columns.create({
-        data: {
-          id: crypto.randomUUID(),
-          title: 'A Fazer',
-          order: 0,
-          boardId: newBoard.id,
-          createdAt: new Date(),
-          updatedAt: new Date()
-        }
+          createdAt: now,
+          updatedAt: now,
+          columns: {
+            create: {
+              id: crypto.randomUUID(),
+              title: 'A Fazer',
+              order: 0,
+              createdAt: now,
+              updatedAt: now
+            }
+          }
+        },
+        include: { columns: true }
       })
 
-      return column.id
+      return newBoard.columns[0].id
     }
 
     return board.columns[0].id
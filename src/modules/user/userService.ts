@@ -2,15 +2,17 @@ import { prisma } from '../../prisma/client'
 import { User } from '@prisma/client'
 
 export class UserService {
-  async findById(id: string): Promise<User | null> {
+  /**
+   * Busca apenas os campos usados no contexto da Lumi.
+   * As tarefas pendentes são carregadas separadamente pelo TaskService.
+   */
+  async findById(id: string): Promise<Pick<User, 'id' | 'name' | 'email'> | null> {
     return prisma.user.findUnique({
       where: { id },
-      include: {
-        tasks: {
-          where: { completed: false },
-          orderBy: { createdAt: 'desc' },
-          take: 10
-        }
+      select: {
+        id: true,
+        name: true,
+        email: true
       }
     })
   }
@@ -34,14 +36,21 @@ export class UserService {
     activeTasks: number
     completionRate: number
   }> {
-    const [totalTasks, completedTasks] = await Promise.all([
-      prisma.tasks.count({
-        where: { userId }
-      }),
-      prisma.tasks.count({
-        where: { userId, completed: true }
-      })
-    ])
+    // Uma única contagem agrupada por status; os demais números são derivados dela
+    const groups = await prisma.tasks.groupBy({
+      by: ['completed'],
+      where: { userId },
+      _count: { _all: true }
+    })
+
+    let totalTasks = 0
+    let completedTasks = 0
+    for (const group of groups) {
+      totalTasks += group._count._all
+      if (group.completed) {
+        completedTasks = group._count._all
+      }
+    }
 
     const activeTasks = totalTasks - completedTasks
     const completionRate = totalTasks > 0 ? completedTasks / totalTasks : 0
@@ -378,8 +378,10 @@ export async function debugRoutes(fastify: FastifyInstance) {
       
       console.log('🔍 [DEBUG] ===== VERIFICAÇÃO DE INCONSISTÊNCIAS =====')
       
+      // As contagens são feitas no banco: não carregamos todas as tarefas do sistema em memória
+      
       // 1. Verificar se há tarefas órfãs (sem usuário válido)
-      const orphanTasks = await prisma.tasks.findMany({
+      const orphanTasks = await prisma.tasks.count({
         where: {
           NOT: {
             User: {
@@ -391,21 +393,22 @@ export async function debugRoutes(fastify: FastifyInstance) {
         }
       })
       
-      console.log('🔍 [DEBUG] Tarefas órfãs (sem usuário):', orphanTasks.length)
+      console.log('🔍 [DEBUG] Tarefas órfãs (sem usuário):', orphanTasks)
       
       // 2. Verificar se há tarefas com userId inválido
-      const allTasks = await prisma.tasks.findMany({
-        include: {
-          User: true
-        }
-      })
-      
-      const tasksWithInvalidUser = allTasks.filter(task => !task.User)
-      console.log('🔍 [DEBUG] Tarefas com userId inválido:', tasksWithInvalidUser.length)
+      const [{ count: tasksWithInvalidUser }] = await prisma.$queryRaw<Array<{ count: number }>>`
+        SELECT COUNT(*)::int AS count
+        FROM "tasks" t
+        LEFT JOIN "User" u ON u."id" = t."userId"
+        WHERE u."id" IS NULL
+      `
+      console.log('🔍 [DEBUG] Tarefas com userId inválido:', tasksWithInvalidUser)
       
       // 3. Verificar tarefas do usuário atual
-      const userTasks = allTasks.filter(task => task.userId === user.id)
-      console.log('🔍 [DEBUG] Tarefas do usuário atual:', userTasks.length)
+      const userTasks = await prisma.tasks.count({
+        where: { userId: user.id }
+      })
+      console.log('🔍 [DEBUG] Tarefas do usuário atual:', userTasks)
       
       // 4. Verificar todos os usuários no sistema
       const allUsers = await prisma.user.findMany({
@@ -435,9 +438,9 @@ export async function debugRoutes(fastify: FastifyInstance) {
             id: user.id,
             name: user.name
           },
-          orphanTasks: orphanTasks.length,
-          tasksWithInvalidUser: tasksWithInvalidUser.length,
-          userTasks: userTasks.length,
+          orphanTasks,
+          tasksWithInvalidUser,
+          userTasks,
           totalUsers: allUsers.length,
           userStats: allUsers.map(u => ({
             id: u.id,
@@ -7,10 +7,33 @@ import { rateLimitMiddleware } from './middlewares/rateLimiter'
 import { memoryRoutes } from './modules/memory/memoryRoutes'
 import { assistantRoutes } from './modules/assistant/assistantRoutes'
 import { authRoutes } from './modules/auth/authRoutes'
-import { debugRoutes } from './routes/debug'
 import { memoryCleanupJob } from './jobs/memoryCleanup'
 import { prisma } from './prisma/client'
 
+const APP_VERSION = '1.0.0'
+
+// Resultado do último teste de banco do /health, reaproveitado por alguns segundos
+// para que rajadas de health checks não virem uma consulta por requisição
+const HEALTH_CHECK_TTL = 5 * 1000 // 5 segundos
+let lastHealthCheck: { healthy: boolean; checkedAt: number } | null = null
+
+async function isDatabaseHealthy(): Promise<boolean> {
+  const now = Date.now()
+  if (lastHealthCheck && now - lastHealthCheck.checkedAt < HEALTH_CHECK_TTL) {
+    return lastHealthCheck.healthy
+  }
+
+  let healthy = true
+  try {
+    await prisma.$queryRaw`SELECT 1`
+  } catch {
+    healthy = false
+  }
+
+  lastHealthCheck = { healthy, checkedAt: now }
+  return healthy
+}
+
 export async function buildServer() {
   const server = fastify({
     logger: true,
@@ -43,7 +66,10 @@ export async function buildServer() {
     methods: ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
     allowedHeaders: ['Content-Type', 'Authorization'],
     preflightContinue: false,
-    optionsSuccessStatus: 204
+    optionsSuccessStatus: 204,
+    // Permite que o navegador reaproveite o preflight por 24h em vez de
+    // enviar um OPTIONS antes de cada chamada autenticada
+    maxAge: 86400
   })
 
   // Registra WebSocket
@@ -59,25 +85,23 @@ export async function buildServer() {
 
   // Health check
   server.get('/health', async (request, reply) => {
-    try {
-      // Testa conexão com o banco
-      await prisma.$queryRaw`SELECT 1`
-      
+    // Testa conexão com o banco (resultado em cache por HEALTH_CHECK_TTL)
+    if (await isDatabaseHealthy()) {
       return {
         status: 'ok',
         timestamp: new Date().toISOString(),
-        version: '1.0.0',
+        version: APP_VERSION,
         database: 'connected'
       }
-    } catch (error) {
-      return reply.status(503).send({
-        status: 'error',
-        timestamp: new Date().toISOString(),
-        version: '1.0.0',
-        database: 'disconnected',
-        error: 'Database connection failed'
-      })
     }
+
+    return reply.status(503).send({
+      status: 'error',
+      timestamp: new Date().toISOString(),
+      version: APP_VERSION,
+      database: 'disconnected',
+      error: 'Database connection failed'
+    })
   })
 
   // Endpoint simples para testar CORS
@@ -96,7 +120,9 @@ export async function buildServer() {
   server.register(assistantRoutes, { prefix: '/api' })
   
   // Registra rotas de debug (apenas em desenvolvimento)
+  // O módulo é importado sob demanda para não ser carregado na inicialização em produção
   if (process.env.NODE_ENV === 'development') {
+    const { debugRoutes } = await import('./routes/debug')
     server.register(debugRoutes, { prefix: '/api' })
   }
 
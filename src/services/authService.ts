@@ -1,5 +1,7 @@
 import jwt from 'jsonwebtoken'
 import { prisma } from '../prisma/client'
+import { authUserCache } from '../config/cache'
+import { User } from '@prisma/client'
 
 /**
  * Interface para o payload do JWT
@@ -14,10 +16,11 @@ export interface JWTPayload {
   exp?: number
 }
 
+// Usuário mantido no authUserCache: cobre tanto verifyToken quanto getUserById
+type AuthUser = Pick<User, 'id' | 'name' | 'email' | 'theme' | 'profileImage' | 'createdAt' | 'lastCheckIn'>
+
 export class AuthService {
   private readonly jwtSecret: string
-  private userCache: Map<string, { user: any; timestamp: number }> = new Map()
-  private readonly CACHE_TTL = 5 * 60 * 1000 // 5 minutos
 
   constructor() {
     this.jwtSecret = process.env.JWT_SECRET || 'fallback-secret-key'
@@ -27,30 +30,15 @@ export class AuthService {
     }
   }
 
-  /**
-   * Limpa cache expirado
-   */
-  private cleanExpiredCache() {
-    const now = Date.now()
-    for (const [key, value] of this.userCache.entries()) {
-      if (now - value.timestamp > this.CACHE_TTL) {
-        this.userCache.delete(key)
-      }
-    }
-  }
-
   /**
    * Busca usuário no cache ou banco
+   * A expiração fica a cargo do NodeCache (authUserCache)
    */
-  private async getUserFromCacheOrDB(userId: string) {
-    // Limpa cache expirado
-    this.cleanExpiredCache()
-    
-    // Verifica cache
-    const cached = this.userCache.get(userId)
-    if (cached && (Date.now() - cached.timestamp) < this.CACHE_TTL) {
-      console.log('📋 AuthService: Usuário encontrado no cache:', cached.user.name)
-      return cached.user
+  private async getUserFromCacheOrDB(userId: string): Promise<AuthUser | null> {
+    const cached = authUserCache.get<AuthUser>(userId)
+    if (cached) {
+      console.log('📋 AuthService: Usuário encontrado no cache:', cached.name)
+      return cached
     }
 
     // Busca no banco
@@ -61,27 +49,18 @@ export class AuthService {
         id: true, 
         name: true, 
         email: true,
+        theme: true,
+        profileImage: true,
         createdAt: true,
-        updatedAt: true
+        lastCheckIn: true
       }
     })
 
     if (user) {
       // Adiciona ao cache
-      this.userCache.set(userId, {
-        user: {
-          userId: user.id,
-          email: user.email,
-          name: user.name
-        },
-        timestamp: Date.now()
-      })
+      authUserCache.set(userId, user)
       console.log('✅ AuthService: Usuário encontrado:', user.name)
-      return {
-        userId: user.id,
-        email: user.email,
-        name: user.name
-      }
+      return user
     }
 
     return null
@@ -95,19 +74,13 @@ export class AuthService {
    */
   async verifyToken(token: string): Promise<JWTPayload | null> {
     try {
-      console.log('🔍 AuthService: Iniciando verificação do token')
-      console.log('🔍 Token recebido (primeiros 50 chars):', token.substring(0, 50) + '...')
-      
       // Força uso do algoritmo HS256 para compatibilidade com Toivo
       const decoded = jwt.verify(token, this.jwtSecret, { 
         algorithms: ['HS256'] 
       }) as JWTPayload
-      console.log('✅ AuthService: Token decodificado com sucesso')
-      console.log('🔍 Payload decodificado:', JSON.stringify(decoded, null, 2))
       
       // Determina o ID do usuário, aceitando tanto userId quanto id
       const userId = decoded.userId || decoded.id
-      console.log('🔍 AuthService: userId extraído:', userId)
       
       if (!userId) {
         console.warn('❌ AuthService: Token JWT não contém campo userId nem id')
@@ -123,7 +96,7 @@ export class AuthService {
       }
 
       return {
-        userId: user.userId,
+        userId: user.id,
         email: user.email,
         name: user.name
       }
@@ -177,10 +150,17 @@ export class AuthService {
    */
   async updateLastCheckIn(userId: string): Promise<void> {
     try {
+      const lastCheckIn = new Date()
       await prisma.user.update({
         where: { id: userId },
-        data: { lastCheckIn: new Date() }
+        data: { lastCheckIn }
       })
+
+      // Mantém o usuário cacheado em dia sem descartá-lo (o cache não clona os objetos)
+      const cached = authUserCache.get<AuthUser>(userId)
+      if (cached) {
+        cached.lastCheckIn = lastCheckIn
+      }
     } catch (error) {
       console.warn('Erro ao atualizar lastCheckIn:', error)
     }
@@ -1,4 +1,4 @@
-import { ConversationContext, TaskContextMatch } from '../types'
+import { ConversationContext, ConversationTurn, TaskContextMatch } from '../types'
 
 /**
  * 🧠 SERVIÇO DE CONTEXTO DE CONVERSA
@@ -10,6 +10,19 @@ import { ConversationContext, TaskContextMatch } from '../types'
 // Cache em memória para contextos de conversa (em produção, usar Redis)
 const conversationCache = new Map<string, ConversationContext>()
 
+// Mantém apenas os últimos turnos para não sobrecarregar
+const MAX_HISTORY_TURNS = 10
+
+// Limite de contextos em memória: o Map mantém ordem de inserção, então
+// reinserir no acesso deixa os menos usados no início para serem descartados
+const MAX_CACHED_CONTEXTS = 1000
+
+// Stopwords comuns removidas no matching de tarefas (Set: consulta O(1) por palavra)
+const STOPWORDS: ReadonlySet<string> = new Set([
+  'o', 'a', 'os', 'as', 'um', 'uma', 'de', 'do', 'da', 'em', 'no', 'na', 'para', 'com', 'por',
+  'que', 'não', 'mais', 'como', 'muito', 'também', 'já', 'seu', 'sua', 'estou', 'está'
+])
+
 export class ConversationContextService {
   
   /**
@@ -17,22 +30,34 @@ export class ConversationContextService {
    */
   getOrCreateContext(userId: string): ConversationContext {
     let context = conversationCache.get(userId)
+    // Um único instante para toda a operação (criação e checagem de sessão)
+    const now = new Date()
     
-    if (!context) {
+    if (context) {
+      // Move para o fim (mais recente) na ordem do Map
+      conversationCache.delete(userId)
+    } else {
       context = {
         userId,
         conversationHistory: [],
-        sessionStartTime: new Date(),
-        lastInteractionTime: new Date()
+        sessionStartTime: now,
+        lastInteractionTime: now
+      }
+    }
+    conversationCache.set(userId, context)
+
+    if (conversationCache.size > MAX_CACHED_CONTEXTS) {
+      const oldestUserId = conversationCache.keys().next().value
+      if (oldestUserId !== undefined) {
+        conversationCache.delete(oldestUserId)
       }
-      conversationCache.set(userId, context)
     }
     
     // Limpa histórico se a sessão estiver muito antiga (>2 horas)
-    const timeSinceLastInteraction = Date.now() - context.lastInteractionTime.getTime()
+    const timeSinceLastInteraction = now.getTime() - context.lastInteractionTime.getTime()
     if (timeSinceLastInteraction > 2 * 60 * 60 * 1000) {
       context.conversationHistory = []
-      context.sessionStartTime = new Date()
+      context.sessionStartTime = now
       context.lastIntent = undefined
       context.currentEmotion = undefined
       context.focusedTaskId = undefined
@@ -53,27 +78,28 @@ export class ConversationContextService {
     aiResponse?: string
   ): ConversationContext {
     const context = this.getOrCreateContext(userId)
+    const now = new Date()
     
     // Adiciona nova interação ao histórico
-    context.conversationHistory.push({
-      timestamp: new Date(),
+    const turn: ConversationTurn = {
+      timestamp: now,
       userMessage,
       detectedEmotion,
       intent,
       aiResponse
-    })
+    }
+    context.conversationHistory.push(turn)
     
-    // Mantém apenas os últimos 10 turnos para não sobrecarregar
-    if (context.conversationHistory.length > 10) {
-      context.conversationHistory = context.conversationHistory.slice(-10)
+    // Descarta o turno mais antigo no próprio array, sem copiar o histórico
+    if (context.conversationHistory.length > MAX_HISTORY_TURNS) {
+      context.conversationHistory.shift()
     }
     
-    // Atualiza estado atual
+    // Atualiza estado atual (o objeto já está no cache, não precisa de set)
     context.lastIntent = intent
     context.currentEmotion = detectedEmotion
-    context.lastInteractionTime = new Date()
+    context.lastInteractionTime = now
     
-    conversationCache.set(userId, context)
     return context
   }
 
@@ -84,7 +110,6 @@ export class ConversationContextService {
     const context = this.getOrCreateContext(userId)
     context.focusedTaskId = taskId
     context.focusedTaskTitle = taskTitle
-    conversationCache.set(userId, context)
   }
 
   /**
@@ -95,6 +120,11 @@ export class ConversationContextService {
     userMessage: string, 
     tasks: Array<{ id: string; title: string; description?: string }>
   ): TaskContextMatch[] {
+    // Usuário sem tarefas (ex.: usuário novo): nada para comparar, evita todo o pipeline
+    if (tasks.length === 0) {
+      return []
+    }
+
     const matches: TaskContextMatch[] = []
     const messageLower = userMessage.toLowerCase()
     
@@ -102,50 +132,17 @@ export class ConversationContextService {
     console.log('🔍 Matching - Tarefas:', tasks.map(t => t.title))
     
     // Remove stopwords comuns e normaliza
-    const stopwords = ['o', 'a', 'os', 'as', 'um', 'uma', 'de', 'do', 'da', 'em', 'no', 'na', 'para', 'com', 'por', 'que', 'não', 'mais', 'como', 'muito', 'também', 'já', 'seu', 'sua', 'estou', 'está']
-    
-    const messageWords = this.extractSignificantWords(messageLower, stopwords)
+    const messageWords = this.extractSignificantWords(messageLower)
     console.log('🔍 Matching - Palavras da mensagem:', messageWords)
 
     for (const task of tasks) {
       const taskText = (task.title + ' ' + (task.description || '')).toLowerCase()
-      const taskWords = this.extractSignificantWords(taskText, stopwords)
-      
-      console.log(`🔍 Matching - Tarefa "${task.title}":`, taskWords)
-      
-      // 1. Verifica match exato de frases importantes
-      const exactPhraseMatch = this.findExactPhraseMatches(messageLower, taskText)
-      
-      // 2. Calcula similaridade por palavras individuais
-      const wordMatches = this.findWordMatches(messageWords, taskWords)
-      
-      // 3. Verifica palavras-chave importantes
-      const keywordMatch = this.hasImportantKeywordMatch(messageLower, taskText)
-      
-      let similarity = 0
-      let isExactMatch = false
-      const matchedKeywords: string[] = []
-      
-      // Prioriza matches exatos de frases
-      if (exactPhraseMatch.length > 0) {
-        similarity = 1.0
-        isExactMatch = true
-        matchedKeywords.push(...exactPhraseMatch)
-        console.log(`🎯 Match exato de frase para "${task.title}":`, exactPhraseMatch)
-      }
-      // Senão, verifica palavras-chave importantes
-      else if (keywordMatch.keywords.length > 0) {
-        similarity = keywordMatch.similarity
-        isExactMatch = keywordMatch.isExact
-        matchedKeywords.push(...keywordMatch.keywords)
-        console.log(`🎯 Match de palavra-chave para "${task.title}":`, keywordMatch.keywords, 'similaridade:', similarity)
-      }
-      // Por último, similaridade por palavras comuns
-      else if (wordMatches.length > 0) {
-        similarity = wordMatches.length / Math.max(messageWords.length, taskWords.length, 1)
-        matchedKeywords.push(...wordMatches)
-        console.log(`🔍 Match de palavras para "${task.title}":`, wordMatches, 'similaridade:', similarity)
-      }
+      const { similarity, isExactMatch, matchedKeywords } = this.scoreTaskMatch(
+        task.title,
+        taskText,
+        messageLower,
+        messageWords
+      )
       
       if (similarity > 0.2) { // Lowered threshold
         matches.push({
@@ -168,14 +165,62 @@ export class ConversationContextService {
     return sortedMatches
   }
 
+  /**
+   * Pontua uma tarefa contra a mensagem. As estratégias são avaliadas em ordem de
+   * prioridade e param na primeira que encontrar algo: a comparação palavra a palavra
+   * (com Levenshtein) é a mais cara e só roda quando frases e palavras-chave falham
+   */
+  private scoreTaskMatch(
+    title: string,
+    taskText: string,
+    messageLower: string,
+    messageWords: string[]
+  ): { similarity: number; isExactMatch: boolean; matchedKeywords: string[] } {
+    // 1. Prioriza matches exatos de frases importantes
+    const exactPhraseMatch = this.findExactPhraseMatches(messageLower, taskText)
+    if (exactPhraseMatch.length > 0) {
+      console.log(`🎯 Match exato de frase para "${title}":`, exactPhraseMatch)
+      return { similarity: 1.0, isExactMatch: true, matchedKeywords: exactPhraseMatch }
+    }
+
+    // 2. Senão, verifica palavras-chave importantes
+    const keywordMatch = this.hasImportantKeywordMatch(messageLower, taskText)
+    if (keywordMatch.keywords.length > 0) {
+      console.log(`🎯 Match de palavra-chave para "${title}":`, keywordMatch.keywords, 'similaridade:', keywordMatch.similarity)
+      return {
+        similarity: keywordMatch.similarity,
+        isExactMatch: keywordMatch.isExact,
+        matchedKeywords: keywordMatch.keywords
+      }
+    }
+
+    // 3. Por último, similaridade por palavras individuais
+    const taskWords = this.extractSignificantWords(taskText)
+    console.log(`🔍 Matching - Tarefa "${title}":`, taskWords)
+
+    const wordMatches = this.findWordMatches(messageWords, taskWords)
+    if (wordMatches.length > 0) {
+      const similarity = wordMatches.length / Math.max(messageWords.length, taskWords.length, 1)
+      console.log(`🔍 Match de palavras para "${title}":`, wordMatches, 'similaridade:', similarity)
+      return { similarity, isExactMatch: false, matchedKeywords: wordMatches }
+    }
+
+    return { similarity: 0, isExactMatch: false, matchedKeywords: [] }
+  }
+
   /**
    * Extrai palavras significativas (remove stopwords e normaliza)
+   * Normaliza e filtra na mesma passada, sem arrays intermediários
    */
-  private extractSignificantWords(text: string, stopwords: string[]): string[] {
-    return text
-      .split(/\s+/)
-      .map(word => word.replace(/[^\w]/g, '').toLowerCase())
-      .filter(word => word.length > 2 && !stopwords.includes(word))
+  private extractSignificantWords(text: string): string[] {
+    const words: string[] = []
+    for (const rawWord of text.split(/\s+/)) {
+      const word = rawWord.replace(/[^\w]/g, '').toLowerCase()
+      if (word.length > 2 && !STOPWORDS.has(word)) {
+        words.push(word)
+      }
+    }
+    return words
   }
 
   /**
@@ -222,11 +267,21 @@ export class ConversationContextService {
     return messageWords.filter(word => 
       taskWords.some(taskWord => 
         taskWord.includes(word) || word.includes(taskWord) || 
-        this.calculateLevenshteinSimilarity(word, taskWord) > 0.8
+        (this.canBeLevenshteinSimilar(word, taskWord) && this.calculateLevenshteinSimilarity(word, taskWord) > 0.8)
       )
     )
   }
 
+  /**
+   * A distância de Levenshtein é no mínimo a diferença de tamanho entre as palavras,
+   * então se essa diferença já passa de 20% da maior, a similaridade nunca chega a 0.8
+   * e dá para pular a matriz inteira
+   */
+  private canBeLevenshteinSimilar(word1: string, word2: string): boolean {
+    const longest = Math.max(word1.length, word2.length)
+    return Math.abs(word1.length - word2.length) < longest * 0.2
+  }
+
   /**
    * Verifica se há match de palavras-chave importantes (contexto específico)
    */
@@ -292,32 +347,40 @@ export class ConversationContextService {
     return (longer.length - distance) / longer.length
   }
 
+  /**
+   * Distância de Levenshtein mantendo só duas linhas da matriz (anterior e atual)
+   * em vez da matriz completa, com arrays tipados e comparação por charCode
+   */
   private levenshteinDistance(str1: string, str2: string): number {
-    const matrix = []
-    
-    for (let i = 0; i <= str2.length; i++) {
-      matrix[i] = [i]
-    }
-    
+    let previous = new Uint16Array(str1.length + 1)
+    let current = new Uint16Array(str1.length + 1)
+
     for (let j = 0; j <= str1.length; j++) {
-      matrix[0][j] = j
+      previous[j] = j
     }
-    
+
     for (let i = 1; i <= str2.length; i++) {
+      current[0] = i
+      const char2 = str2.charCodeAt(i - 1)
+
       for (let j = 1; j <= str1.length; j++) {
-        if (str2.charAt(i - 1) === str1.charAt(j - 1)) {
-          matrix[i][j] = matrix[i - 1][j - 1]
+        if (char2 === str1.charCodeAt(j - 1)) {
+          current[j] = previous[j - 1]
         } else {
-          matrix[i][j] = Math.min(
-            matrix[i - 1][j - 1] + 1,
-            matrix[i][j - 1] + 1,
-            matrix[i - 1][j] + 1
+          current[j] = Math.min(
+            previous[j - 1] + 1,
+            current[j - 1] + 1,
+            previous[j] + 1
           )
         }
       }
+
+      const swap = previous
+      previous = current
+      current = swap
     }
-    
-    return matrix[str2.length][str1.length]
+
+    return previous[str1.length]
   }
 
   /**
@@ -360,17 +423,21 @@ export class ConversationContextService {
   /**
    * Detecta padrões emocionais nas interações recentes
    */
-  private detectEmotionalPattern(interactions: ConversationContext['conversationHistory']): string | null {
+  private detectEmotionalPattern(interactions: ConversationTurn[]): string | null {
     if (interactions.length < 2) return null
     
     const emotions = interactions.map(i => i.detectedEmotion)
     
-    // Detecta persistência emocional
+    // Detecta persistência emocional: tamanho da sequência contínua que termina
+    // na última interação (varre de trás pra frente sem alterar o array)
     const lastEmotion = emotions[emotions.length - 1]
-    const persistentCount = emotions.reverse().findIndex(e => e !== lastEmotion)
+    let streak = 1
+    while (streak < emotions.length && emotions[emotions.length - 1 - streak] === lastEmotion) {
+      streak++
+    }
     
-    if (persistentCount >= 2) {
-      return `${lastEmotion} persistente (${persistentCount + 1} interações)`
+    if (streak >= 2) {
+      return `${lastEmotion} persistente (${streak} interações)`
     }
     
     // Detecta mudanças bruscas
@@ -1,19 +1,19 @@
 import { z } from 'zod'
 
+// Aceita UUID padrão (36 caracteres com hífens) ou Nano ID (tipicamente 21 caracteres, mas pode variar)
+// em uma única regex, para validar cada ID com um só teste
+const ID_REGEX = /^(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[A-Za-z0-9_-]{10,30})$/i
+
 // Schema personalizado para aceitar IDs no formato Nano ID ou UUID
-const idSchema = z.string().refine(
-  (val) => {
-    // Aceita UUID padrão (36 caracteres com hífens)
-    const uuidRegex = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i
-    // Aceita Nano ID (tipicamente 21 caracteres, mas pode variar)
-    const nanoIdRegex = /^[A-Za-z0-9_-]{10,30}$/
-    
-    return uuidRegex.test(val) || nanoIdRegex.test(val)
-  },
-  {
-    message: "ID deve ser um UUID válido ou um Nano ID válido"
-  }
-)
+const idSchema = z.string().regex(ID_REGEX, {
+  message: "ID deve ser um UUID válido ou um Nano ID válido"
+})
+
+// Enums compartilhados: cada schema é construído uma única vez e reutilizado
+// pelos schemas de criação e de consulta de memórias
+const memoryTypeSchema = z.enum(['PERSONAL_INFO', 'PERSONAL_CONTEXT', 'WORK_CONTEXT', 'STUDY_CONTEXT', 'PRODUCTIVITY_PATTERN', 'EMOTIONAL_STATE', 'COMMUNICATION_STYLE', 'GOALS_PROJECTS', 'PREFERENCES', 'IMPORTANT_DATES', 'FEEDBACK'])
+
+const memoryImportanceSchema = z.enum(['LOW', 'MEDIUM', 'HIGH', 'CRITICAL'])
 
 // Esquemas para validação de entrada
 export const askRequestSchema = z.object({
@@ -34,9 +34,9 @@ export const askRequestSchema = z.object({
 
 export const memoryCreateSchema = z.object({
   userId: idSchema,
-  type: z.enum(['PERSONAL_INFO', 'PERSONAL_CONTEXT', 'WORK_CONTEXT', 'STUDY_CONTEXT', 'PRODUCTIVITY_PATTERN', 'EMOTIONAL_STATE', 'COMMUNICATION_STYLE', 'GOALS_PROJECTS', 'PREFERENCES', 'IMPORTANT_DATES', 'FEEDBACK']),
+  type: memoryTypeSchema,
   content: z.string().min(1).max(5000),
-  importance: z.enum(['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']).default('MEDIUM'),
+  importance: memoryImportanceSchema.default('MEDIUM'),
   emotionalContext: z.string().optional(),
   productivityPattern: z.string().optional(),
   communicationStyle: z.string().optional(),
@@ -50,8 +50,8 @@ export const memoryUpdateSchema = memoryCreateSchema.partial().extend({
 
 export const memoryQuerySchema = z.object({
   userId: idSchema,
-  type: z.enum(['PERSONAL_INFO', 'PERSONAL_CONTEXT', 'WORK_CONTEXT', 'STUDY_CONTEXT', 'PRODUCTIVITY_PATTERN', 'EMOTIONAL_STATE', 'COMMUNICATION_STYLE', 'GOALS_PROJECTS', 'PREFERENCES', 'IMPORTANT_DATES', 'FEEDBACK']).optional(),
-  importance: z.enum(['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']).optional(),
+  type: memoryTypeSchema.optional(),
+  importance: memoryImportanceSchema.optional(),
   tags: z.array(z.string()).optional(),
   limit: z.number().min(1).max(100).default(50),
   offset: z.number().min(0).default(0),
@@ -64,6 +64,14 @@ export type MemoryUpdate = z.infer<typeof memoryUpdateSchema>
 export type MemoryQuery = z.infer<typeof memoryQuerySchema>
 
 // Novos tipos para contexto de conversa e memória de curto prazo
+export interface ConversationTurn {
+  timestamp: Date
+  userMessage: string
+  detectedEmotion: string
+  intent: string
+  aiResponse?: string
+}
+
 export interface ConversationContext {
   userId: string
   lastIntent?: string
@@ -71,13 +79,7 @@ export interface ConversationContext {
   emotionalIntensity?: 'low' | 'medium' | 'high'
   focusedTaskId?: string
   focusedTaskTitle?: string
-  conversationHistory: Array<{
-    timestamp: Date
-    userMessage: string
-    detectedEmotion: string
-    intent: string
-    aiResponse?: string
-  }>
+  conversationHistory: ConversationTurn[]
   sessionStartTime: Date
   lastInteractionTime: Date
 }
@@ -37,7 +37,15 @@
  *           melhor experiência do usuário com respostas adequadas ao contexto.
  */
 
-import { EmotionalAnalysis } from '../types'
+import { EmotionalAnalysis, ConversationContext } from '../types'
+
+/**
+ * Junta uma lista de regex em uma única alternação, para testar a mensagem em uma
+ * só passada em vez de uma passada por padrão
+ */
+function combinePatterns(patterns: RegExp[]): RegExp {
+  return new RegExp(patterns.map(pattern => `(?:${pattern.source})`).join('|'), 'i')
+}
 
 const emotionalKeywords = {
   happy: ['feliz', 'alegre', 'animado', 'contente', 'satisfeito', 'empolgado', 'bem', 'ótimo', 'maravilhoso', 'incrível', 'radiante', 'eufórico'],
@@ -128,6 +136,7 @@ const informationalQuestionPatterns = [
   /^existe (algum|alguma)/i,
   /^me (explica|conta|fala)/i
 ]
+const informationalQuestionRegex = combinePatterns(informationalQuestionPatterns)
 
 // Expressões indiretas refinadas - mais específicas
 const indirectEmotionalExpressions = {
@@ -264,6 +273,7 @@ const neutralPatterns = [
   // Confirmações e agradecimentos
   /perfeito/i, /show/i, /massa/i, /beleza/i
 ]
+const neutralPatternRegex = combinePatterns(neutralPatterns)
 
 // 🎯 NOVA ADIÇÃO: Contextos que reduzem intensidade emocional
 const casualContexts = [
@@ -271,7 +281,99 @@ const casualContexts = [
   'me tira uma dúvida', 'uma pergunta rápida', 'só checando'
 ]
 
+// Pré-filtro: uma única regex com todas as expressões e palavras-chave emocionais.
+// A maioria das mensagens não tem nenhuma, então evitamos os loops de includes por emoção
+const emotionalTermsRegex = new RegExp(
+  [...Object.values(indirectEmotionalExpressions), ...Object.values(emotionalKeywords)]
+    .flat()
+    .map(term => term.replace(/[.*+?^${}()|[\]\\]/g, '\\$&'))
+    .join('|')
+)
+
+// Tabelas achatadas (emoção, termo), montadas uma vez: o laço por mensagem percorre
+// uma lista simples em vez de chamar Object.entries e aninhar forEach a cada análise
+const indirectExpressionTable: ReadonlyArray<readonly [string, string]> = Object.entries(indirectEmotionalExpressions)
+  .flatMap(([emotion, expressions]) => expressions.map(expression => [emotion, expression] as const))
+
+const emotionalKeywordTable: ReadonlyArray<readonly [string, string]> = Object.entries(emotionalKeywords)
+  .flatMap(([emotion, keywords]) => keywords.map(keyword => [emotion, keyword] as const))
+
+// Tabelas fixas da validação final e da análise com histórico - montadas uma única
+// vez no carregamento do módulo, não a cada mensagem analisada
+
+// Emoções opostas (usado para detectar mudanças bruscas no histórico)
+const emotionalOpposites: Record<string, string[]> = {
+  'happy': ['sad', 'frustrated', 'tired'],
+  'sad': ['happy', 'excited', 'energetic'],
+  'excited': ['tired', 'sad', 'desmotivacao'],
+  'frustrated': ['happy', 'calm', 'satisfied'],
+  'calm': ['anxious', 'frustrated', 'stressed'],
+  'anxious': ['calm', 'relaxed'],
+  'motivated': ['desmotivacao', 'tired'],
+  'desmotivacao': ['motivated', 'excited', 'energetic']
+}
+
+// Cumprimentos
+const greetingPatterns = [
+  /^(oi|olá|hey|e aí|opa|fala)/i,
+  /(bom dia|boa tarde|boa noite)/i,
+  /^(tchau|até|falou|valeu)/i
+]
+
+// Agradecimentos
+const thankPatterns = [
+  /obrigad[oa]/i, /valeu/i, /muito bom/i, /legal/i, /show/i
+]
+
+// Perguntas técnicas
+const technicalQuestionPatterns = [
+  /como (instalar|configurar|usar|fazer|criar)/i,
+  /qual (comando|função|biblioteca|framework)/i,
+  /onde (encontro|baixo|instalo)/i,
+  /(error|erro|exception|bug)/i
+]
+
+// Contradições emocionais: emoção dominante → emoções que ela anula
+const contradictingEmotions = Object.entries({
+  'happy': ['sad', 'frustrated', 'desmotivacao'],
+  'excited': ['tired', 'desmotivacao', 'melancholy'],
+  'focused': ['confusao', 'procrastinacao'],
+  'motivated': ['desmotivacao', 'procrastinacao'],
+  'calm': ['anxious', 'stressed', 'frustrated']
+})
+
+// Memoização da análise por mensagem: a análise depende só do texto, e mensagens
+// curtas ("oi", "obrigado", "tô cansado") se repetem muito. LRU simples sobre Map
+const MAX_CACHED_ANALYSES = 500
+const analysisCache = new Map<string, EmotionalAnalysis>()
+
+/**
+ * Analisa o estado emocional de uma mensagem (resultado compartilhado via cache:
+ * quem precisar alterar a análise deve criar um novo objeto, como faz analyzeEmotionWithContext)
+ */
 export function analyzeEmotion(message: string): EmotionalAnalysis {
+  const cached = analysisCache.get(message)
+  if (cached) {
+    // Reinsere para marcar como usado recentemente
+    analysisCache.delete(message)
+    analysisCache.set(message, cached)
+    return cached
+  }
+
+  const analysis = computeEmotionalAnalysis(message)
+
+  if (analysisCache.size >= MAX_CACHED_ANALYSES) {
+    const oldestKey = analysisCache.keys().next().value
+    if (oldestKey !== undefined) {
+      analysisCache.delete(oldestKey)
+    }
+  }
+  analysisCache.set(message, analysis)
+
+  return analysis
+}
+
+function computeEmotionalAnalysis(message: string): EmotionalAnalysis {
   const lowerMessage = message.toLowerCase()
   const detectedEmotions: Record<string, number> = {}
   const foundKeywords: string[] = []
@@ -280,7 +382,7 @@ export function analyzeEmotion(message: string): EmotionalAnalysis {
   let needsSupport = false
 
   // 🎯 VERIFICAÇÃO DE NEUTRALIDADE PRIMEIRO
-  const isNeutralPattern = neutralPatterns.some(pattern => pattern.test(message))
+  const isNeutralPattern = neutralPatternRegex.test(message)
   const isCasualContext = casualContexts.some(context => lowerMessage.includes(context))
   
   if (isNeutralPattern || isCasualContext) {
@@ -288,7 +390,7 @@ export function analyzeEmotion(message: string): EmotionalAnalysis {
   }
 
   // 🎯 NOVA LÓGICA: Verifica se é pergunta informacional primeiro
-  const isInformationalQuestion = isInformationalQuestionCheck(message)
+  const isInformationalQuestion = isInformationalQuestionCheck(lowerMessage)
   if (isInformationalQuestion) {
     contextualClues.push('Pergunta informacional detectada - não indica confusão emocional')
     
@@ -307,30 +409,29 @@ export function analyzeEmotion(message: string): EmotionalAnalysis {
     }
   }
 
-  // Analisa expressões indiretas primeiro (mais específicas e peso maior)
-  Object.entries(indirectEmotionalExpressions).forEach(([emotion, expressions]) => {
-    expressions.forEach(expression => {
+  // Só percorre as listas por emoção se o pré-filtro encontrou algum termo
+  if (emotionalTermsRegex.test(lowerMessage)) {
+    // Analisa expressões indiretas primeiro (mais específicas e peso maior)
+    // 🎯 AJUSTE: Reduz peso se for contexto neutro/casual
+    const expressionWeight = (isNeutralPattern || isCasualContext) ? 2 : 3
+    for (const [emotion, expression] of indirectExpressionTable) {
       if (lowerMessage.includes(expression)) {
-        // 🎯 AJUSTE: Reduz peso se for contexto neutro/casual
-        const weight = (isNeutralPattern || isCasualContext) ? 2 : 3
-        detectedEmotions[emotion] = (detectedEmotions[emotion] || 0) + weight
+        detectedEmotions[emotion] = (detectedEmotions[emotion] || 0) + expressionWeight
         foundKeywords.push(expression)
         contextualClues.push(`Expressão indireta de ${emotion}: "${expression}"`)
       }
-    })
-  })
+    }
 
-  // Analisa palavras-chave diretas (peso reduzido)
-  Object.entries(emotionalKeywords).forEach(([emotion, keywords]) => {
-    keywords.forEach(keyword => {
+    // Analisa palavras-chave diretas (peso reduzido)
+    // 🎯 AJUSTE: Peso ainda menor para contextos casuais
+    const keywordWeight = (isNeutralPattern || isCasualContext) ? 0.4 : 0.8
+    for (const [emotion, keyword] of emotionalKeywordTable) {
       if (lowerMessage.includes(keyword)) {
-        // 🎯 AJUSTE: Peso ainda menor para contextos casuais
-        const weight = (isNeutralPattern || isCasualContext) ? 0.4 : 0.8
-        detectedEmotions[emotion] = (detectedEmotions[emotion] || 0) + weight
+        detectedEmotions[emotion] = (detectedEmotions[emotion] || 0) + keywordWeight
         foundKeywords.push(keyword)
       }
-    })
-  })
+    }
+  }
 
   // Detecta intensificadores
   const hasIntensifier = intensifiers.some(intensifier => lowerMessage.includes(intensifier))
@@ -362,21 +463,30 @@ export function analyzeEmotion(message: string): EmotionalAnalysis {
   // 🎯 SISTEMA DE VALIDAÇÃO FINAL
   const validatedEmotions = validateEmotionalClassification(detectedEmotions, message, contextualClues)
 
+  // Pontuação total e emoção dominante numa única passada, sem montar e
+  // ordenar um array de entradas. Maior estrito = empate fica com a primeira
+  let totalScore = 0
+  let dominantEmotion: string | null = null
+  let dominantScore = 0
+  for (const emotion in validatedEmotions) {
+    const score = validatedEmotions[emotion]
+    totalScore += score
+    if (dominantEmotion === null || score > dominantScore) {
+      dominantEmotion = emotion
+      dominantScore = score
+    }
+  }
+
   // Determina intensidade baseada na pontuação total
-  const totalScore = Object.values(validatedEmotions).reduce((sum, score) => sum + score, 0)
   if (totalScore >= 4) emotionalIntensity = 'high'
   else if (totalScore >= 2) emotionalIntensity = 'medium'
 
-  // Encontra a emoção dominante
-  const dominantEmotion = Object.entries(validatedEmotions)
-    .sort(([,a], [,b]) => b - a)[0]
-
   const detectedMood = dominantEmotion 
-    ? dominantEmotion[0] as EmotionalAnalysis['detectedMood']
+    ? dominantEmotion as EmotionalAnalysis['detectedMood']
     : 'neutral'
   
   const confidence = dominantEmotion 
-    ? Math.min(dominantEmotion[1] / 4, 1) // Ajustado para nova pontuação
+    ? Math.min(dominantScore / 4, 1) // Ajustado para nova pontuação
     : 0
 
   // 🎯 AJUSTE FINAL: Reduz confiança para contextos casuais
@@ -400,14 +510,11 @@ export function analyzeEmotion(message: string): EmotionalAnalysis {
 
 /**
  * 🎯 NOVA FUNÇÃO: Detecta se é pergunta informacional
+ * Recebe a mensagem já em minúsculas (calculada uma única vez em computeEmotionalAnalysis)
  */
-function isInformationalQuestionCheck(message: string): boolean {
-  const lowerMessage = message.toLowerCase()
-  
+function isInformationalQuestionCheck(lowerMessage: string): boolean {
   // Verifica padrões de pergunta informacional
-  const hasInformationalPattern = informationalQuestionPatterns.some(pattern => 
-    pattern.test(lowerMessage)
-  )
+  const hasInformationalPattern = informationalQuestionRegex.test(lowerMessage)
   
   // Verifica se tem sinais de confusão emocional real
   const hasRealConfusionSigns = realConfusionExpressions.some(expression =>
@@ -418,6 +525,13 @@ function isInformationalQuestionCheck(message: string): boolean {
   return hasInformationalPattern && !hasRealConfusionSigns
 }
 
+// Listas de palavras da análise contextual - fixas, criadas uma vez no carregamento do módulo
+const confusionWords = ['perdido', 'confuso', 'não entendo', 'não faço ideia']
+const realProblemWords = ['projeto', 'trabalho', 'situação', 'problema', 'vida']
+const procrastinationTimeWords = ['depois', 'mais tarde', 'amanhã', 'próxima', 'quando der']
+const positiveIntense = ['adorei', 'amei', 'perfeito', 'incrível', 'fantástico', 'maravilhoso']
+const focusWords = ['concentrado', 'focado', 'produtivo', 'trabalhando', 'fazendo']
+
 /**
  * 🎯 ANÁLISE CONTEXTUAL MELHORADA
  */
@@ -441,8 +555,7 @@ function analyzeImprovedContextualClues(
   
   // INTERROGAÇÃO: Só indica confusão se tiver outros sinais
   if (message.includes('?') && !isInformationalQuestion) {
-    const confusionWords = ['perdido', 'confuso', 'não entendo', 'não faço ideia']
-    const hasConfusionWords = confusionWords.some(word => message.toLowerCase().includes(word))
+    const hasConfusionWords = confusionWords.some(word => message.includes(word))
     
     if (hasConfusionWords && !isNeutralContext) {
       detectedEmotions.confusao = (detectedEmotions.confusao || 0) + 0.5
@@ -450,7 +563,11 @@ function analyzeImprovedContextualClues(
     }
   }
   
-  const exclamationCount = (message.match(/!/g) || []).length
+  // Conta as exclamações sem montar o array de matches de message.match(/!/g)
+  let exclamationCount = 0
+  for (let index = message.indexOf('!'); index !== -1; index = message.indexOf('!', index + 1)) {
+    exclamationCount++
+  }
   if (exclamationCount >= 2 && !isNeutralContext) {
     detectedEmotions.entusiasmo = (detectedEmotions.entusiasmo || 0) + 1
     detectedEmotions.excited = (detectedEmotions.excited || 0) + 0.5
@@ -459,8 +576,8 @@ function analyzeImprovedContextualClues(
 
   // Padrões de linguagem REFINADOS
   // Só marca confusão se for contexto de problema real
-  const hasRealProblemContext = ['projeto', 'trabalho', 'situação', 'problema', 'vida'].some(word => 
-    message.toLowerCase().includes(word)
+  const hasRealProblemContext = realProblemWords.some(word => 
+    message.includes(word)
   )
   
   if (message.includes('não') && (message.includes('consigo') || message.includes('sei')) && hasRealProblemContext && !isNeutralContext) {
@@ -477,7 +594,6 @@ function analyzeImprovedContextualClues(
   }
 
   // Outros padrões ajustados para contexto...
-  const procrastinationTimeWords = ['depois', 'mais tarde', 'amanhã', 'próxima', 'quando der']
   if (procrastinationTimeWords.some(word => message.includes(word)) && !isNeutralContext) {
     detectedEmotions.procrastinacao = (detectedEmotions.procrastinacao || 0) + 1
     contextualClues.push('Linguagem temporal indica procrastinação')
@@ -490,7 +606,6 @@ function analyzeImprovedContextualClues(
     contextualClues.push('Quantificadores de sobrecarga detectados')
   }
 
-  const positiveIntense = ['adorei', 'amei', 'perfeito', 'incrível', 'fantástico', 'maravilhoso']
   if (positiveIntense.some(word => message.includes(word))) {
     const enthusiasmWeight = isNeutralContext ? 0.5 : 1
     detectedEmotions.entusiasmo = (detectedEmotions.entusiasmo || 0) + enthusiasmWeight
@@ -498,7 +613,6 @@ function analyzeImprovedContextualClues(
     contextualClues.push('Expressões positivas intensas detectadas')
   }
 
-  const focusWords = ['concentrado', 'focado', 'produtivo', 'trabalhando', 'fazendo']
   if (focusWords.some(word => message.includes(word))) {
     const focusWeight = isNeutralContext ? 0.5 : 1
     detectedEmotions.foco = (detectedEmotions.foco || 0) + focusWeight
@@ -506,6 +620,39 @@ function analyzeImprovedContextualClues(
   }
 }
 
+type StrategyPair = readonly [EmotionalAnalysis['responseStrategy'], EmotionalAnalysis['responseStrategy']]
+
+// Estratégia de resposta por humor: [intensidade alta, demais intensidades].
+// Consulta direta na tabela em vez de percorrer a cadeia de cases a cada análise
+const responseStrategyTable: Partial<Record<EmotionalAnalysis['detectedMood'], StrategyPair>> = {
+  confused: ['guide', 'structure'],
+  confusao: ['guide', 'structure'],
+  overwhelmed: ['calm', 'structure'],
+  sobrecarregado: ['calm', 'structure'],
+  procrastinating: ['gentle_push', 'motivate'],
+  procrastinacao: ['gentle_push', 'motivate'],
+  stuck: ['guide', 'guide'],
+  frustrated: ['empathize', 'reassure'],
+  excited: ['energize', 'energize'],
+  entusiasmo: ['energize', 'energize'],
+  determined: ['challenge', 'challenge'],
+  foco: ['challenge', 'challenge'],
+  tired: ['calm', 'support'],
+  anxious: ['ground', 'calm'],
+  stressed: ['ground', 'calm'],
+  sad: ['empathize', 'encourage'],
+  melancholy: ['empathize', 'encourage'],
+  desmotivacao: ['empathize', 'encourage'],
+  happy: ['energize', 'energize'],
+  energetic: ['energize', 'energize'],
+  motivated: ['challenge', 'challenge'],
+  focused: ['challenge', 'challenge'],
+  hopeful: ['encourage', 'encourage'],
+  calm: ['motivate', 'motivate'],
+  curious: ['guide', 'guide'],
+  proud: ['share_origin', 'share_origin']
+}
+
 function getAdvancedResponseStrategy(
   mood: EmotionalAnalysis['detectedMood'], 
   intensity: 'low' | 'medium' | 'high',
@@ -516,68 +663,12 @@ function getAdvancedResponseStrategy(
     return 'support'
   }
 
-  switch (mood) {
-    case 'confused':
-    case 'confusao':
-      return intensity === 'high' ? 'guide' : 'structure'
-    
-    case 'overwhelmed':
-    case 'sobrecarregado':
-      return intensity === 'high' ? 'calm' : 'structure'
-    
-    case 'procrastinating':
-    case 'procrastinacao':
-      return intensity === 'high' ? 'gentle_push' : 'motivate'
-    
-    case 'stuck':
-      return 'guide'
-    
-    case 'frustrated':
-      return intensity === 'high' ? 'empathize' : 'reassure'
-    
-    case 'excited':
-    case 'entusiasmo':
-      return 'energize'
-    
-    case 'determined':
-    case 'foco':
-      return 'challenge'
-    
-    case 'tired':
-      return intensity === 'high' ? 'calm' : 'support'
-    
-    case 'anxious':
-    case 'stressed':
-      return intensity === 'high' ? 'ground' : 'calm'
-    
-    case 'sad':
-    case 'melancholy':
-    case 'desmotivacao':
-      return intensity === 'high' ? 'empathize' : 'encourage'
-    
-    case 'happy':
-    case 'energetic':
-      return 'energize'
-    
-    case 'motivated':
-    case 'focused':
-      return 'challenge'
-    
-    case 'hopeful':
-      return 'encourage'
-    
-    case 'calm':
-      return 'motivate'
-    
-    case 'curious':
-      return 'guide'
-    
-    case 'proud':
-      return 'share_origin'
-    
-    default:
-      return 'motivate'
+  const strategies = responseStrategyTable[mood]
+  if (!strategies) {
+    return 'motivate'
   }
+
+  return intensity === 'high' ? strategies[0] : strategies[1]
 }
 
 export function getEmotionalTone(strategy: EmotionalAnalysis['responseStrategy']): 'supportive' | 'motivational' | 'calm' | 'enthusiastic' | 'gentle' {
@@ -610,26 +701,31 @@ export function getEmotionalTone(strategy: EmotionalAnalysis['responseStrategy']
  */
 export function analyzeEmotionWithContext(
   message: string, 
-  conversationContext?: any
+  conversationContext?: ConversationContext
 ): EmotionalAnalysis {
   const baseAnalysis = analyzeEmotion(message)
   
   // Se não há contexto, retorna análise básica
-  if (!conversationContext || !conversationContext.conversationHistory) {
+  if (!conversationContext || conversationContext.conversationHistory.length === 0) {
     return baseAnalysis
   }
   
   const history = conversationContext.conversationHistory
-  const recentEmotions = history.slice(-3).map((entry: any) => entry.detectedEmotion)
+  const recentEmotions = history.slice(-3).map(entry => entry.detectedEmotion)
   
   // 🎯 AJUSTES BASEADOS NO CONTEXTO
   
   // Se o usuário tem histórico de perguntas informacionais, reduz chance de confusão
-  const recentQuestions = history.slice(-5).filter((entry: any) => 
-    entry.userMessage.includes('?') && !entry.detectedEmotion.includes('confus')
-  )
+  // Só a contagem importa: percorre os últimos 5 turnos sem copiar nem filtrar o histórico
+  let recentQuestionCount = 0
+  for (let i = Math.max(history.length - 5, 0); i < history.length; i++) {
+    const entry = history[i]
+    if (entry.userMessage.includes('?') && !entry.detectedEmotion.includes('confus')) {
+      recentQuestionCount++
+    }
+  }
   
-  if (recentQuestions.length >= 2 && baseAnalysis.detectedMood === 'confused') {
+  if (recentQuestionCount >= 2 && baseAnalysis.detectedMood === 'confused') {
     // Usuário tem padrão de fazer perguntas - provavelmente é curiosidade
     return {
       ...baseAnalysis,
@@ -682,26 +778,26 @@ function getMostFrequentEmotion(emotions: string[]): string | null {
     frequency[emotion] = (frequency[emotion] || 0) + 1
   })
   
-  return Object.entries(frequency)
-    .sort(([,a], [,b]) => b - a)[0]?.[0] || null
+  // Lista minúscula (últimas 3 emoções): basta um laço pelo máximo, sem montar
+  // e ordenar um array de entradas. Maior estrito = empate fica com a que
+  // apareceu primeiro, como na ordenação estável anterior
+  let mostFrequent: string | null = null
+  let highestCount = 0
+  for (const emotion in frequency) {
+    if (frequency[emotion] > highestCount) {
+      highestCount = frequency[emotion]
+      mostFrequent = emotion
+    }
+  }
+  
+  return mostFrequent || null
 }
 
 /**
  * Verifica se duas emoções são opostas
  */
 function isEmotionallyOpposite(emotion1: string, emotion2: string): boolean {
-  const opposites: Record<string, string[]> = {
-    'happy': ['sad', 'frustrated', 'tired'],
-    'sad': ['happy', 'excited', 'energetic'],
-    'excited': ['tired', 'sad', 'desmotivacao'],
-    'frustrated': ['happy', 'calm', 'satisfied'],
-    'calm': ['anxious', 'frustrated', 'stressed'],
-    'anxious': ['calm', 'relaxed'],
-    'motivated': ['desmotivacao', 'tired'],
-    'desmotivacao': ['motivated', 'excited', 'energetic']
-  }
-  
-  return opposites[emotion1]?.includes(emotion2) || false
+  return emotionalOpposites[emotion1]?.includes(emotion2) || false
 }
 
 /**
@@ -713,16 +809,10 @@ function validateEmotionalClassification(
   originalMessage: string,
   contextualClues: string[]
 ): Record<string, number> {
-  const lowerMessage = originalMessage.toLowerCase()
+  // Os padrões abaixo usam a flag /i, então testamos direto na mensagem original
   const validatedEmotions = { ...detectedEmotions }
   
   // 🎯 REGRA 1: Cumprimentos não são confusão
-  const greetingPatterns = [
-    /^(oi|olá|hey|e aí|opa|fala)/i,
-    /(bom dia|boa tarde|boa noite)/i,
-    /^(tchau|até|falou|valeu)/i
-  ]
-  
   const isGreeting = greetingPatterns.some(pattern => pattern.test(originalMessage.trim()))
   if (isGreeting && validatedEmotions.confusao) {
     delete validatedEmotions.confusao
@@ -730,25 +820,14 @@ function validateEmotionalClassification(
   }
   
   // 🎯 REGRA 2: Agradecimentos são positivos, não neutros
-  const thankPatterns = [
-    /obrigad[oa]/i, /valeu/i, /muito bom/i, /legal/i, /show/i
-  ]
-  
-  const isThanking = thankPatterns.some(pattern => pattern.test(lowerMessage))
+  const isThanking = thankPatterns.some(pattern => pattern.test(originalMessage))
   if (isThanking && Object.keys(validatedEmotions).length === 0) {
     validatedEmotions.happy = 1.5
     contextualClues.push('Validação: Agradecimento detectado - classificado como positivo')
   }
   
   // 🎯 REGRA 3: Perguntas técnicas específicas não são confusão emocional
-  const technicalQuestionPatterns = [
-    /como (instalar|configurar|usar|fazer|criar)/i,
-    /qual (comando|função|biblioteca|framework)/i,
-    /onde (encontro|baixo|instalo)/i,
-    /(error|erro|exception|bug)/i
-  ]
-  
-  const isTechnicalQuestion = technicalQuestionPatterns.some(pattern => pattern.test(lowerMessage))
+  const isTechnicalQuestion = technicalQuestionPatterns.some(pattern => pattern.test(originalMessage))
   if (isTechnicalQuestion && validatedEmotions.confusao) {
     // Reduz drasticamente ou remove confusão
     if (validatedEmotions.confusao <= 1) {
@@ -774,15 +853,7 @@ function validateEmotionalClassification(
   }
   
   // 🎯 REGRA 5: Contradições emocionais (remove emoções fracas quando há opostas fortes)
-  const emotionalOpposites = {
-    'happy': ['sad', 'frustrated', 'desmotivacao'],
-    'excited': ['tired', 'desmotivacao', 'melancholy'],
-    'focused': ['confusao', 'procrastinacao'],
-    'motivated': ['desmotivacao', 'procrastinacao'],
-    'calm': ['anxious', 'stressed', 'frustrated']
-  }
-  
-  Object.entries(emotionalOpposites).forEach(([emotion, opposites]) => {
+  contradictingEmotions.forEach(([emotion, opposites]) => {
     if (validatedEmotions[emotion] && validatedEmotions[emotion] >= 2) {
       opposites.forEach(opposite => {
         if (validatedEmotions[opposite] && validatedEmotions[opposite] < validatedEmotions[emotion]) {
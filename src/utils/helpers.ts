@@ -42,24 +42,32 @@ export function calculateTextSimilarity(text1: string, text2: string): number {
   const words1 = text1.toLowerCase().split(/\s+/)
   const words2 = text2.toLowerCase().split(/\s+/)
   
-  const intersection = words1.filter(word => words2.includes(word))
-  const union = [...new Set([...words1, ...words2])]
+  // Consulta por Set em vez de words2.includes para cada palavra (O(n + m), não O(n * m)),
+  // e sem montar os arrays intermediários da interseção e da união
+  const words2Set = new Set(words2)
+  const union = new Set(words2)
+  let intersectionCount = 0
+  for (const word of words1) {
+    if (words2Set.has(word)) intersectionCount++
+    union.add(word)
+  }
   
-  return intersection.length / union.length
+  return intersectionCount / union.size
 }
 
 export function prioritizeMemories(memories: any[], userMessage: string): any[] {
+  // A pontuação final (relevância + importância) é calculada uma vez por memória,
+  // não a cada comparação do sort
   return memories
-    .map(memory => ({
-      ...memory,
-      relevanceScore: calculateTextSimilarity(memory.content, userMessage)
-    }))
-    .sort((a, b) => {
-      // Prioriza por relevância e importância
-      const scoreA = a.relevanceScore + (getImportanceWeight(a.importance))
-      const scoreB = b.relevanceScore + (getImportanceWeight(b.importance))
-      return scoreB - scoreA
+    .map(memory => {
+      const relevanceScore = calculateTextSimilarity(memory.content, userMessage)
+      return {
+        memory: { ...memory, relevanceScore },
+        score: relevanceScore + getImportanceWeight(memory.importance)
+      }
     })
+    .sort((a, b) => b.score - a.score)
+    .map(entry => entry.memory)
 }
 
 function getImportanceWeight(importance: string): number {
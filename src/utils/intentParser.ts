@@ -1,5 +1,7 @@
 import { groq, GROQ_MODEL } from "../config/groq";
 import { z } from "zod";
+import { createHash } from "crypto";
+import { intentCache, INTENT_CACHE_MAX_KEYS } from "../config/cache";
 
 /**
  * 🧠 PARSER DE INTENÇÃO VIA LLM - EMOCIONALMENTE INTELIGENTE
@@ -70,6 +72,17 @@ export const ParsedIntentSchema = z.object({
 
 export type ParsedIntent = z.infer<typeof ParsedIntentSchema>;
 
+// Intenção padrão usada quando o LLM falha: objeto único e congelado,
+// compartilhado por todos os caminhos de erro em vez de recriado a cada falha
+const FALLBACK_INTENT: ParsedIntent = Object.freeze({
+  intent: "none",
+  confidence: 0.0,
+  emotionalState: "neutral",
+  supportNeeded: false,
+  emotionalIntensity: "low",
+  suggestedResponse: "support"
+} as const);
+
 /**
  * Função principal que analisa a intenção do usuário usando o modelo LLaMA 3 70B
  * Agora com capacidade de detectar nuances emocionais e expressões indiretas
@@ -79,6 +92,14 @@ export async function parseUserIntentFromLumi(
   userId: string,
   userBoards?: Array<{ id: string; title: string }>
 ): Promise<ParsedIntent> {
+  // Mensagens repetidas (reenvios, "oi", "obrigado") no mesmo minuto geram exatamente
+  // o mesmo prompt: reaproveitamos a intenção já interpretada em vez de chamar o LLM
+  const cacheKey = buildIntentCacheKey(input, userId, userBoards);
+  const cached = intentCache.get<ParsedIntent>(cacheKey);
+  if (cached) {
+    return cached;
+  }
+
   try {
     const prompt = buildEmotionallyIntelligentPrompt(input, userBoards);
 
@@ -99,22 +120,36 @@ export async function parseUserIntentFromLumi(
     const validatedResponse = ParsedIntentSchema.parse(jsonResponse);
     const processedResponse = processDateFields(validatedResponse);
 
+    // Cache cheio: segue sem cachear (o NodeCache lança erro ao passar de maxKeys)
+    if (intentCache.getStats().keys < INTENT_CACHE_MAX_KEYS) {
+      intentCache.set(cacheKey, processedResponse);
+    }
     return processedResponse;
   } catch (error) {
     console.error("Erro no parseUserIntentFromLumi:", error);
 
     // Fallback gracioso com análise emocional básica
-    return {
-      intent: "none",
-      confidence: 0.0,
-      emotionalState: "neutral",
-      supportNeeded: false,
-      emotionalIntensity: "low",
-      suggestedResponse: "support"
-    };
+    return FALLBACK_INTENT;
   }
 }
 
+/**
+ * Chave do cache de intenções: tudo que altera o prompt (usuário, quadros,
+ * minuto atual do relógio e a mensagem sem espaços redundantes). Quadros e
+ * mensagem entram como hash, para a chave ter tamanho fixo
+ */
+function buildIntentCacheKey(
+  input: string,
+  userId: string,
+  userBoards?: Array<{ id: string; title: string }>
+): string {
+  const minute = Math.floor(Date.now() / 60000);
+  const boards = userBoards ? userBoards.map((board) => `${board.id}=${board.title}`).join(",") : "";
+  const normalizedInput = input.trim().replace(/\s+/g, " ");
+  const digest = createHash("sha256").update(boards).update("\0").update(normalizedInput).digest("base64");
+  return `${userId}:${minute}:${digest}`;
+}
+
 /**
  * Constrói um prompt emocionalmente inteligente que ensina o modelo a detectar
  * tanto intenções práticas quanto estados emocionais e expressões indiretas
@@ -124,13 +159,7 @@ function buildEmotionallyIntelligentPrompt(
   userBoards?: Array<{ id: string; title: string }>
 ): string {
   // 🔧 CORREÇÃO CRÍTICA: Usar horário brasileiro consistentemente
-  const now = new Date();
-  
-  // Força timezone brasileiro para data e hora
-  const brasilTime = new Date(now.toLocaleString("en-US", {timeZone: "America/Sao_Paulo"}));
-  const currentDate = brasilTime.toISOString().split("T")[0]; // YYYY-MM-DD em horário brasileiro
-  const currentTime = brasilTime.toTimeString().split(" ")[0].substring(0, 5); // HH:MM em horário brasileiro
-  const currentDayOfWeek = brasilTime.toLocaleDateString("pt-BR", { weekday: "long", timeZone: "America/Sao_Paulo" });
+  const { currentDate, currentTime, currentDayOfWeek, nextDay } = getBrasilClock();
 
   console.log('🔍 DEBUG - Hora enviada ao LLM:', currentTime, 'Data:', currentDate);
 
@@ -151,7 +180,7 @@ CONTEXTO TEMPORAL (Timezone: America/Sao_Paulo):
 IMPORTANTE PARA DATAS:
 - Use SEMPRE o timezone brasileiro (UTC-3)
 - Para "hoje às 18h30", retorne: "${currentDate}T18:30:00"
-- Para "amanhã às 9h", retorne: "${getNextDayBrazilian(currentDate)}T09:00:00"
+- Para "amanhã às 9h", retorne: "${nextDay}T09:00:00"
 - Para horários relativos, baseie-se na hora atual: ${currentTime}
 
 ${boardsContext}
@@ -242,7 +271,7 @@ Entrada: "Preciso estudar para a prova amanhã às 14h"
 Saída: {
   "intent": "create_task",
   "title": "Estudar para prova",
-  "startAt": "${getNextDayBrazilian(currentDate)}T14:00:00",
+  "startAt": "${nextDay}T14:00:00",
   "priority": "HIGH",
   "emotionalState": "motivated",
   "supportNeeded": false,
@@ -307,6 +336,42 @@ AGORA ANALISE ESTA MENSAGEM:
 "${input}"`;
 }
 
+interface BrasilClock {
+  currentDate: string;
+  currentTime: string;
+  currentDayOfWeek: string;
+  nextDay: string;
+}
+
+// Cache do relógio brasileiro: o prompt só usa precisão de minuto (HH:MM),
+// então recalculamos as strings no máximo uma vez por minuto
+let brasilClockCache: { minute: number; clock: BrasilClock } | null = null;
+
+/**
+ * Retorna data, hora, dia da semana e próximo dia no horário brasileiro
+ */
+function getBrasilClock(): BrasilClock {
+  const now = new Date();
+  const minute = Math.floor(now.getTime() / 60000);
+
+  if (brasilClockCache && brasilClockCache.minute === minute) {
+    return brasilClockCache.clock;
+  }
+
+  // Força timezone brasileiro para data e hora
+  const brasilTime = new Date(now.toLocaleString("en-US", {timeZone: "America/Sao_Paulo"}));
+  const currentDate = brasilTime.toISOString().split("T")[0]; // YYYY-MM-DD em horário brasileiro
+  const clock: BrasilClock = {
+    currentDate,
+    currentTime: brasilTime.toTimeString().split(" ")[0].substring(0, 5), // HH:MM em horário brasileiro
+    currentDayOfWeek: brasilTime.toLocaleDateString("pt-BR", { weekday: "long", timeZone: "America/Sao_Paulo" }),
+    nextDay: getNextDayBrazilian(currentDate)
+  };
+
+  brasilClockCache = { minute, clock };
+  return clock;
+}
+
 // 🔧 FUNÇÃO AUXILIAR: Calcular próximo dia em horário brasileiro
 function getNextDayBrazilian(currentDate: string): string {
   const tomorrow = new Date(currentDate);
@@ -365,6 +430,51 @@ function processDateFields(response: ParsedIntent): ParsedIntent {
   return processed;
 }
 
+// Mapeamento de contexto da tarefa -> termos de quadro (montado uma vez no carregamento)
+const BOARD_CONTEXT_MAPPINGS = [
+  {
+    // Contexto de trabalho - mais abrangente
+    keywords: [
+      "trabalho", "reunião", "reuniao", "cliente", "projeto", "apresentação", "apresentacao",
+      "relatório", "relatorio", "meeting", "api", "integração", "integracao", "sistema",
+      "desenvolvimento", "codigo", "programação", "programacao", "deploy", "banco", "dados",
+      "certidão", "certidao", "frontend", "backend", "infosimples", "emissão", "emissao"
+    ],
+    searchTerms: ["trabalho", "profissional", "emprego", "job", "work", "projeto", "dev"]
+  },
+  {
+    // Contexto de academia/exercícios
+    keywords: [
+      "academia", "treino", "exercício", "exercicio", "musculação", "musculacao",
+      "corrida", "yoga", "pilates", "crossfit", "perna", "braço", "braco"
+    ],
+    searchTerms: ["academia", "treino", "exercícios", "exercicios", "fitness", "gym"]
+  },
+  {
+    // Contexto de estudos
+    keywords: [
+      "estudo", "prova", "faculdade", "curso", "aula", "universidade",
+      "estudar", "ler", "revisar", "pesquisa"
+    ],
+    searchTerms: ["faculdade", "estudos", "universidade", "curso", "educação", "educacao"]
+  }
+];
+
+// Termos que identificam quadros genéricos
+const GENERIC_BOARD_TERMS = ["agenda", "geral", "minha agenda", "tarefas", "principal", "minha", "pessoal"];
+
+// Categoria sugerida pelo modelo -> nome do quadro a ser criado
+const CATEGORY_TO_BOARD_NAME: Record<string, string> = {
+  trabalho: "Trabalho",
+  estudos: "Estudos",
+  academia: "Academia",
+  saúde: "Saúde",
+  compras: "Compras",
+  casa: "Casa",
+  pessoal: "Pessoal",
+  geral: "Minha Agenda",
+};
+
 /**
  * Função para tomar decisão inteligente sobre qual quadro usar
  * baseado na intenção analisada e quadros existentes do usuário
@@ -418,44 +528,14 @@ export function decideBoardForTask(
   console.log('🔍 Contexto da tarefa:', taskContext)
 
   // 🔧 PRIORIDADE 1: Busca direta por quadros existentes relacionados ao contexto
-  // Mapeamento mais abrangente e específico
-  const directMappings = [
-    {
-      // Contexto de trabalho - mais abrangente
-      keywords: [
-        "trabalho", "reunião", "reuniao", "cliente", "projeto", "apresentação", "apresentacao",
-        "relatório", "relatorio", "meeting", "api", "integração", "integracao", "sistema",
-        "desenvolvimento", "codigo", "programação", "programacao", "deploy", "banco", "dados",
-        "certidão", "certidao", "frontend", "backend", "infosimples", "emissão", "emissao"
-      ],
-      searchTerms: ["trabalho", "profissional", "emprego", "job", "work", "projeto", "dev"]
-    },
-    {
-      // Contexto de academia/exercícios
-      keywords: [
-        "academia", "treino", "exercício", "exercicio", "musculação", "musculacao",
-        "corrida", "yoga", "pilates", "crossfit", "perna", "braço", "braco"
-      ],
-      searchTerms: ["academia", "treino", "exercícios", "exercicios", "fitness", "gym"]
-    },
-    {
-      // Contexto de estudos
-      keywords: [
-        "estudo", "prova", "faculdade", "curso", "aula", "universidade",
-        "estudar", "ler", "revisar", "pesquisa"
-      ],
-      searchTerms: ["faculdade", "estudos", "universidade", "curso", "educação", "educacao"]
-    }
-  ]
-
   // Busca por quadros existentes para cada contexto
-  for (const mapping of directMappings) {
-    const hasKeyword = mapping.keywords.some((keyword) =>
+  for (const mapping of BOARD_CONTEXT_MAPPINGS) {
+    const matchedKeyword = mapping.keywords.find((keyword) =>
       taskContext.includes(keyword)
     );
     
-    if (hasKeyword) {
-      console.log('🔍 Keyword encontrada:', mapping.keywords.find(k => taskContext.includes(k)))
+    if (matchedKeyword) {
+      console.log('🔍 Keyword encontrada:', matchedKeyword)
       
       // Busca mais flexível por quadros existentes
       const matchingBoard = userBoards.find((board) => {
@@ -474,9 +554,7 @@ export function decideBoardForTask(
           action: "use_existing",
           boardId: matchingBoard.id,
           boardName: matchingBoard.title,
-          reason: `Tarefa relacionada a ${mapping.keywords.find((k) =>
-            taskContext.includes(k)
-          )} - usando quadro "${matchingBoard.title}"`,
+          reason: `Tarefa relacionada a ${matchedKeyword} - usando quadro "${matchingBoard.title}"`,
         };
       }
     }
@@ -503,7 +581,7 @@ export function decideBoardForTask(
 
   // 🔧 PRIORIDADE 3: Procura por quadros genéricos
   const genericBoards = userBoards.filter((board) =>
-    ["agenda", "geral", "minha agenda", "tarefas", "principal", "minha", "pessoal"].some(
+    GENERIC_BOARD_TERMS.some(
       (generic) => board.title.toLowerCase().includes(generic)
     )
   );
@@ -531,21 +609,8 @@ export function decideBoardForTask(
 
   // 🔧 ÚLTIMA OPÇÃO: Criar novo quadro baseado no contexto ou padrão
   if (intent.boardCategory) {
-    const categoryToBoardName = {
-      trabalho: "Trabalho",
-      estudos: "Estudos",
-      academia: "Academia",
-      saúde: "Saúde",
-      compras: "Compras",
-      casa: "Casa",
-      pessoal: "Pessoal",
-      geral: "Minha Agenda",
-    };
-
     const suggestedName =
-      categoryToBoardName[
-        intent.boardCategory as keyof typeof categoryToBoardName
-      ] || "Minha Agenda";
+      CATEGORY_TO_BOARD_NAME[intent.boardCategory] || "Minha Agenda";
 
     console.log('🆕 Criando novo quadro por categoria:', suggestedName)
     return {
@@ -563,46 +628,53 @@ export function decideBoardForTask(
   };
 }
 
+const TASK_INDICATORS = [
+  // Palavras de ação para tarefas
+  "fazer", "criar", "adicionar", "marcar", "agendar", "lembrar", "preciso", "tenho que", "vou",
+  // Palavras temporais
+  "hoje", "amanhã", "semana", "mês", "hora", "às", "de manhã", "tarde", "noite",
+  // Contextos
+  "reunião", "meeting", "trabalho", "academia", "médico", "compromisso", "tarefa",
+  // Ações em tarefas
+  "completei", "terminei", "finalizei", "acabei", "fiz", "remover", "deletar", "cancelar",
+  // Consultas
+  "lista", "mostrar", "ver", "quais", "que tenho", "agenda",
+];
+
+const EMOTIONAL_INDICATORS = [
+  // Expressões de confusão
+  "não sei", "perdido", "confuso", "não entendo", "não faço ideia",
+  // Expressões de sobrecarga
+  "muita coisa", "não dou conta", "pesado", "não aguento", "sobrecarregado",
+  // Expressões de procrastinação
+  "não estou no clima", "deixa pra depois", "não tenho vontade", "não tô afim",
+  // Expressões de frustração
+  "que saco", "irritante", "não funciona", "que droga", "chatice",
+  // Expressões de empolgação
+  "que legal", "adorei", "incrível", "fantástico", "empolgado",
+  // Pedidos de ajuda
+  "me ajuda", "socorro", "preciso de ajuda", "orienta", "não consigo",
+  // Estados gerais
+  "travado", "bloqueado", "stuck", "parado", "sem direção"
+];
+
+/**
+ * Compila uma lista de palavras-chave em uma única regex (alternação, sem distinção
+ * de maiúsculas), para varrer a mensagem uma vez só em vez de um includes por palavra
+ */
+function buildKeywordRegex(keywords: readonly string[]): RegExp {
+  const escaped = keywords.map((keyword) => keyword.replace(/[.*+?^${}()|[\]\\]/g, "\\$&"));
+  return new RegExp(escaped.join("|"), "i");
+}
+
+// Compilada uma única vez no carregamento do módulo
+const TASK_OR_EMOTIONAL_REGEX = buildKeywordRegex([...TASK_INDICATORS, ...EMOTIONAL_INDICATORS]);
+
 /**
  * Função auxiliar melhorada para detectar potencial de tarefas OU necessidades emocionais
  */
 export function hasTaskOrEmotionalPotential(input: string): boolean {
-  const taskIndicators = [
-    // Palavras de ação para tarefas
-    "fazer", "criar", "adicionar", "marcar", "agendar", "lembrar", "preciso", "tenho que", "vou",
-    // Palavras temporais
-    "hoje", "amanhã", "semana", "mês", "hora", "às", "de manhã", "tarde", "noite",
-    // Contextos
-    "reunião", "meeting", "trabalho", "academia", "médico", "compromisso", "tarefa",
-    // Ações em tarefas
-    "completei", "terminei", "finalizei", "acabei", "fiz", "remover", "deletar", "cancelar",
-    // Consultas
-    "lista", "mostrar", "ver", "quais", "que tenho", "agenda",
-  ];
-
-  const emotionalIndicators = [
-    // Expressões de confusão
-    "não sei", "perdido", "confuso", "não entendo", "não faço ideia",
-    // Expressões de sobrecarga
-    "muita coisa", "não dou conta", "pesado", "não aguento", "sobrecarregado",
-    // Expressões de procrastinação
-    "não estou no clima", "deixa pra depois", "não tenho vontade", "não tô afim",
-    // Expressões de frustração
-    "que saco", "irritante", "não funciona", "que droga", "chatice",
-    // Expressões de empolgação
-    "que legal", "adorei", "incrível", "fantástico", "empolgado",
-    // Pedidos de ajuda
-    "me ajuda", "socorro", "preciso de ajuda", "orienta", "não consigo",
-    // Estados gerais
-    "travado", "bloqueado", "stuck", "parado", "sem direção"
-  ];
-
-  const lowerInput = input.toLowerCase();
-
-  const hasTaskPotential = taskIndicators.some(indicator => lowerInput.includes(indicator));
-  const hasEmotionalPotential = emotionalIndicators.some(indicator => lowerInput.includes(indicator));
-
-  return hasTaskPotential || hasEmotionalPotential;
+  return TASK_OR_EMOTIONAL_REGEX.test(input);
 }
 
 /**
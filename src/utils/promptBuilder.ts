@@ -1,5 +1,11 @@
 import { UserContext, EmotionalAnalysis } from "../types";
 
+// Formatadores de data reaproveitados entre os prompts: toLocaleDateString/TimeString
+// com opções criam um formatador Intl novo a cada chamada
+const fullDateFormatter = new Intl.DateTimeFormat('pt-BR', { weekday: 'long', year: 'numeric', month: 'long', day: 'numeric' });
+const shortDateFormatter = new Intl.DateTimeFormat('pt-BR');
+const timeFormatter = new Intl.DateTimeFormat('pt-BR', { hour: '2-digit', minute: '2-digit' });
+
 export function buildLumiPrompt(
   userMessage: string,
   context: UserContext,
@@ -21,7 +27,7 @@ export function buildLumiPrompt(
 - IMPORTANTE: Se o usuário atual se chama Gabriel mas não for Gabriel Nogueira (seu criador), trate como usuário normal
 
 CONTEXTO ATUAL:
-- Data de hoje: ${new Date().toLocaleDateString('pt-BR', { weekday: 'long', year: 'numeric', month: 'long', day: 'numeric' })}
+- Data de hoje: ${fullDateFormatter.format(new Date())}
 - Usuário atual: ${user.name}
 - Estado emocional detectado: ${emotionalAnalysis.detectedMood}
 - Mensagem: "${userMessage}"
@@ -34,7 +40,7 @@ AGENDA E TAREFAS:`;
   } else {
     prompt += `\n- HOJE: ${todayTasks.length} tarefa(s) agendada(s):`
     todayTasks.forEach((task, index) => {
-      const time = task.startAt ? new Date(task.startAt).toLocaleTimeString('pt-BR', { hour: '2-digit', minute: '2-digit' }) : 'sem horário'
+      const time = task.startAt ? timeFormatter.format(task.startAt) : 'sem horário'
       prompt += `\n  ${index + 1}. ${task.title} (${time}) - ${task.priority}`
     })
   }
@@ -42,20 +48,20 @@ AGENDA E TAREFAS:`;
   if (overdueTasks.length > 0) {
     prompt += `\n- ATRASADAS: ${overdueTasks.length} tarefa(s) em atraso:`
     overdueTasks.slice(0, 3).forEach((task, index) => {
-      const originalDate = task.startAt ? new Date(task.startAt).toLocaleDateString('pt-BR') : 'sem data'
+      const originalDate = task.startAt ? shortDateFormatter.format(task.startAt) : 'sem data'
       prompt += `\n  ${index + 1}. ${task.title} (era para ${originalDate}) - ${task.daysOverdue} dia(s) atrasado - ${task.priority}`
     })
   }
 
   // Tarefas futuras (próximas)
-  const futureTasks = currentTasks.filter(task => 
-    !todayTasks.some(today => today.id === task.id)
-  ).slice(0, 5)
+  // Índice dos ids de hoje montado uma vez, em vez de varrer todayTasks para cada tarefa
+  const todayTaskIds = new Set(todayTasks.map(today => today.id))
+  const futureTasks = currentTasks.filter(task => !todayTaskIds.has(task.id)).slice(0, 5)
   
   if (futureTasks.length > 0) {
     prompt += `\n- PRÓXIMAS: ${futureTasks.length} tarefa(s) futuras:`
     futureTasks.forEach((task, index) => {
-      const date = task.startAt ? new Date(task.startAt).toLocaleDateString('pt-BR') : 'sem data'
+      const date = task.startAt ? shortDateFormatter.format(task.startAt) : 'sem data'
       prompt += `\n  ${index + 1}. ${task.title} (${date}) - ${task.priority}`
     })
   }
@@ -133,6 +139,24 @@ AGENDA E TAREFAS:`;
   return prompt;
 }
 
+// Padrões de extração de memória compilados uma única vez no carregamento do módulo.
+// Todos são ancorados em um literal fixo, o que mantém o custo linear no tamanho da mensagem.
+const MEMORY_EXTRACTION_PATTERNS: readonly RegExp[] = [
+  /trabalho (?:como|na|em) (.+)/i,
+  /estudo (?:de|em) (.+)/i,
+  /projeto (?:de|sobre) (.+)/i,
+  /gosto (?:de|muito) (.+)/i,
+  /não gosto (?:de|muito) (.+)/i,
+  /sou (?:muito|bem|meio) (.+)/i,
+  /tenho (?:que|de) (.+)/i,
+  /preciso (?:de|fazer) (.+)/i,
+  /sempre fico (.+) quando/i,
+  /me sinto (.+) com/i,
+  /fico (.+) com/i,
+  /costumo (.+) quando/i,
+  /geralmente (.+) pela/i,
+];
+
 export function extractMemoryFromResponse(
   response: string,
   userMessage: string
@@ -140,29 +164,12 @@ export function extractMemoryFromResponse(
   const memories: string[] = [];
 
   // Extrai informações importantes mencionadas pelo usuário
-  const importantPatterns = [
-    /trabalho (?:como|na|em) (.+)/i,
-    /estudo (?:de|em) (.+)/i,
-    /projeto (?:de|sobre) (.+)/i,
-    /gosto (?:de|muito) (.+)/i,
-    /não gosto (?:de|muito) (.+)/i,
-    /sou (?:muito|bem|meio) (.+)/i,
-    /tenho (?:que|de) (.+)/i,
-    /preciso (?:de|fazer) (.+)/i,
-    /sempre fico (.+) quando/i,
-    /me sinto (.+) com/i,
-    /fico (.+) com/i,
-    /costumo (.+) quando/i,
-    /geralmente (.+) pela/i,
-  ];
-
-  importantPatterns.forEach((pattern) => {
-    const match = userMessage.match(pattern);
+  for (const pattern of MEMORY_EXTRACTION_PATTERNS) {
+    const match = pattern.exec(userMessage);
     if (match && match[1]) {
       memories.push(match[1].trim());
     }
-  });
+  }
 
   return memories;
 }
-